@@ -0,0 +1,204 @@
+"""
+接口响应捕获 - 记录页面渲染时加载的 JSON 数据（如 Vista 票务/场次接口）
+渲染详情页时通过 page.on("response") 发现接口，之后直接请求接口，跳过浏览器渲染
+"""
+
+import re
+import json
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from publish import API_ENDPOINTS_PATH
+
+# 影院所在时区，带时区偏移的接口时间统一换算到该时区
+THEATER_TZ = ZoneInfo("America/New_York")
+
+# 可能表示放映时间的字段
+TIME_KEYS = ("showtime", "Showtime", "start_time", "startTime", "StartTime", "sessionTime", "SessionTime")
+
+# 可能表示售罄的字段
+SOLD_OUT_KEYS = ("soldOut", "sold_out", "isSoldOut", "IsSoldOut")
+
+# 可能表示剩余座位的字段
+SEATS_KEYS = ("seatsAvailable", "SeatsAvailable", "seats_available")
+
+# 可能表示场次所属电影的字段，可出现在场次对象或其上层对象中
+FILM_ID_KEYS = ("filmId", "FilmId", "film_id", "filmHOCode", "FilmHOCode", "ScheduledFilmId", "vista_film_id")
+
+
+def format_date(dt):
+    """转换为与网站一致的日期格式，例如 Friday April 4"""
+    return f"{dt:%A} {dt:%B} {dt.day}"
+
+
+def format_time(dt):
+    """转换为与网站一致的时间格式，例如 9:15pm"""
+    suffix = "am" if dt.hour < 12 else "pm"
+    return f"{dt.hour % 12 or 12}:{dt:%M}{suffix}"
+
+
+def iter_sessions(data, owner=None):
+    """递归遍历 JSON，产出 (场次对象, 所属电影 ID)；电影 ID 取场次或最近的上层对象中的字段，没有时为 None"""
+    if isinstance(data, dict):
+        owner = next((str(data[key]) for key in FILM_ID_KEYS if data.get(key) is not None), owner)
+        if any(key in data for key in TIME_KEYS):
+            yield data, owner
+            return
+        for value in data.values():
+            yield from iter_sessions(value, owner)
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_sessions(item, owner)
+
+
+def session_status(session):
+    """根据场次对象判断售票状态"""
+    for key in SOLD_OUT_KEYS:
+        if session.get(key):
+            return "Sold Out"
+    for key in SEATS_KEYS:
+        if key in session and session[key] == 0:
+            return "Sold Out"
+    status = session.get("status") or session.get("Status")
+    if isinstance(status, str) and "sold" in status.lower():
+        return "Sold Out"
+    return "Available"
+
+
+def parse_sessions(data, film_id=None):
+    """
+    将接口返回的 JSON 转换为与 all_screenings 相同的结构，日期和场次按时间排序
+
+    指定 film_id 时跳过标明属于其他电影的场次，避免整个影院的场次接口把所有电影的场次算到这部电影上
+    """
+    days = {}
+    for session, owner in iter_sessions(data):
+        if film_id is not None and owner is not None and owner != film_id:
+            continue
+        raw_time = next(session[key] for key in TIME_KEYS if key in session)
+        try:
+            dt = datetime.fromisoformat(str(raw_time).replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        # 同一时刻可能以不同偏移表示（如 UTC 与 -04:00），换算到影院时区；不带时区的视为当地时间
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(THEATER_TZ)
+
+        showtimes = days.setdefault(dt.date(), {})
+        key = (dt.time(), format_time(dt))
+        # 同一时间出现多次时，只要有一次售罄即视为售罄
+        if showtimes.get(key) != "Sold Out":
+            showtimes[key] = session_status(session)
+
+    return [
+        {
+            "date": format_date(day),
+            "showtimes": [{"time": t, "status": s} for (_, t), s in sorted(showtimes.items())]
+        }
+        for day, showtimes in sorted(days.items())
+    ]
+
+
+class ApiCapture:
+    """发现、记录并直接调用页面加载的 JSON 接口"""
+
+    def __init__(self, store_path=API_ENDPOINTS_PATH):
+        self.store_path = Path(store_path)
+        self.endpoints = []  # 接口 URL 模板，电影 ID 用 {film_id} 占位
+        self.samples = {}  # 每个接口最近一次的返回数据，便于调试和制作测试数据
+        self.pending = set()  # 尚未处理完的响应任务
+        self.load()
+
+    def load(self):
+        """读取之前发现的接口"""
+        if not self.store_path.exists():
+            return
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            self.endpoints = stored.get("endpoints", [])
+            self.samples = stored.get("samples", {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"读取接口记录失败: {e}")
+
+    def save(self):
+        """保存已发现的接口和样本数据"""
+        with open(self.store_path, 'w', encoding='utf-8') as f:
+            json.dump({"endpoints": self.endpoints, "samples": self.samples}, f, indent=2, ensure_ascii=False)
+
+    def has_endpoint(self):
+        return bool(self.endpoints)
+
+    def attach(self, page, film_id):
+        """监听页面的所有响应，记录包含该电影场次信息的 JSON"""
+        def on_response(response):
+            task = asyncio.ensure_future(self.handle_response(response, film_id))
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+
+        page.on("response", on_response)
+
+    async def drain(self):
+        """等待所有正在处理的响应完成，需在关闭页面前调用"""
+        if self.pending:
+            await asyncio.gather(*list(self.pending), return_exceptions=True)
+
+    async def handle_response(self, response, film_id):
+        """检查单个响应，是 JSON、URL 中带有该电影 ID 且包含该电影的场次时记录为接口"""
+        # 电影 ID 需完整出现，避免 123 匹配到 91234
+        pattern = re.compile(rf"(?<![0-9A-Za-z]){re.escape(film_id)}(?![0-9A-Za-z])")
+        if not pattern.search(response.url):
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        try:
+            data = await response.json()
+        except Exception:
+            return
+        if not parse_sessions(data, film_id):
+            return
+
+        template = pattern.sub("{film_id}", response.url)
+        if template not in self.endpoints:
+            print(f"发现场次接口: {template}")
+            self.endpoints.append(template)
+        self.samples[template] = data
+
+    def endpoint_urls(self, film_id):
+        """该电影在所有已知接口上的 URL"""
+        return [template.replace("{film_id}", film_id) for template in self.endpoints]
+
+    async def fetch_screenings(self, get_json, film_id):
+        """
+        依次请求该电影的已知接口，返回第一个包含场次的结果；全部失败时返回 None
+
+        get_json(url) 为协程，返回解析后的 JSON，状态码表示失败时返回 None
+        """
+        for url in self.endpoint_urls(film_id):
+            try:
+                data = await get_json(url)
+            except Exception as e:
+                print(f"请求接口 {url} 失败: {e}")
+                continue
+            screenings = parse_sessions(data, film_id) if data is not None else None
+            if screenings:
+                return screenings
+        return None
+
+    async def fetch_direct(self, request_context, film_id):
+        """使用 Playwright 的请求上下文直接请求已知接口获取场次，不渲染页面；全部失败时返回 None"""
+        async def get_json(url):
+            response = await request_context.get(url, timeout=10000)
+            return await response.json() if response.ok else None
+
+        return await self.fetch_screenings(get_json, film_id)
+
+    def fetch_direct_http(self, session, film_id):
+        """使用 requests 会话直接请求已知接口获取场次，不需要浏览器，可在线程池中调用；全部失败时返回 None"""
+        async def get_json(url):
+            response = session.get(url, timeout=10)
+            return response.json() if response.ok else None
+
+        return asyncio.run(self.fetch_screenings(get_json, film_id))
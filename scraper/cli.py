@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+统一命令行入口 - python cli.py <命令> [选项]
+
+  scrape          抓取网站（可选回放/录制存档、多进程、多场馆、性能分析）
+  refresh-status  通过已发现的场次接口刷新售票状态，不启动浏览器
+  export          导出电影数据为 JSON 或 CSV
+  publish         复制到前端的 public/data 目录，可选上传到服务器
+  serve           本地预览前端的构建结果（dist 目录）
+  bench           用录制的存档重复运行完整流程，统计耗时
+  standin         启动生成 Metrograph 结构页面的本地测试服务器，配合 scrape --base-url 做负载测试
+
+各命令只在执行时导入需要的模块，cron 中使用的 publish、export 等轻量命令不会加载 playwright、bs4 或 requests
+"""
+
+import sys
+import argparse
+
+from pathlib import Path
+
+from publish import SCRAPER_DIR, SCRAPER_JSON_PATH, PUBLIC_JSON_PATH, DIST_DIR, API_ENDPOINTS_PATH
+
+
+def cmd_scrape(args):
+    """抓取网站并保存；指定 --venues 时使用多场馆引擎"""
+    import asyncio
+
+    if args.venues:
+        if args.api or args.workers or args.profile or args.base_url:
+            print("--venues 暂不支持 --api、--workers、--profile 和 --base-url")
+            return 2
+        from engine import VenueEngine
+        from venues import get_venue
+
+        try:
+            venues = [get_venue(name) for name in args.venues]
+        except ValueError as e:
+            print(e)
+            return 2
+        engine = VenueEngine(venues, concurrency=args.concurrency, replay_path=args.replay, record_path=args.record)
+        ok = asyncio.run(engine.run(args.output or "venues_movies.json"))
+        if ok and args.publish:
+            print("多场馆数据格式与前端不同，未发布")
+        return 0 if ok else 1
+
+    if args.workers and args.record:
+        print("--record 不能与 --workers 同时使用")
+        return 2
+    if args.workers and args.api:
+        # 工作进程不会保存发现的接口，也没有直接调用接口所需的上次数据
+        print("--api 不能与 --workers 同时使用")
+        return 2
+
+    from metrograph import MetrographScraper
+
+    scraper = MetrographScraper(
+        concurrency=args.concurrency, use_api=args.api,
+        record_path=args.record, replay_path=args.replay,
+        profile_dir=args.profile, profile_mode=args.profile_mode, publish=args.publish,
+        workers=args.workers, queue_path=args.queue,
+        base_url=args.base_url
+    )
+    ok = asyncio.run(scraper.run(str(args.output or SCRAPER_JSON_PATH)))
+    return 0 if ok else 1
+
+
+def cmd_refresh_status(args):
+    """用已发现的场次接口更新已保存数据中的放映场次和售票状态"""
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+    import requests
+    from api_capture import ApiCapture
+    from publish import publish_file
+
+    capture = ApiCapture(args.endpoints)
+    if not capture.has_endpoint():
+        print("尚未发现场次接口，请先运行: python cli.py scrape --api")
+        return 1
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        films = json.load(f)
+
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda film: capture.fetch_direct_http(session, film["id"]), films))
+
+    updated = 0
+    for film, screenings in zip(films, results):
+        if screenings:
+            film["screenings"] = screenings
+            updated += 1
+
+    with open(args.input, 'w', encoding='utf-8') as f:
+        json.dump(films, f, indent=2, ensure_ascii=False)
+    print(f"已刷新 {updated}/{len(films)} 部电影的放映状态")
+
+    if args.publish:
+        publish_file(args.input)
+    return 0
+
+
+def cmd_export(args):
+    """导出电影数据，CSV 每行一个放映场次"""
+    import json
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        films = json.load(f)
+
+    out = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        if args.format == "csv":
+            import csv
+
+            columns = ["id", "title", "director", "year", "runtime", "date", "time", "status", "detail_url"]
+            writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for film in films:
+                for screening in film.get("screenings", []):
+                    for showtime in screening.get("showtimes", []):
+                        writer.writerow({**film, "date": screening["date"], **showtime})
+        else:
+            json.dump(films, out, ensure_ascii=False, indent=None if args.compact else 2)
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_publish(args):
+    """复制到前端目录，可选上传到服务器"""
+    from publish import publish_file, upload_file
+
+    try:
+        publish_file(args.input, args.target)
+        if args.upload:
+            upload_file(args.input, args.upload)
+    except Exception as e:
+        print(f"发布数据失败: {e}")
+        return 1
+    return 0
+
+
+def cmd_serve(args):
+    """预览前端的构建结果，路径带有 vite.config.js 中的 base 前缀，与部署后一致"""
+    import subprocess
+    from functools import partial
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    if args.build:
+        result = subprocess.run(["npm", "run", "build"], cwd=SCRAPER_DIR.parent)
+        if result.returncode != 0:
+            return result.returncode
+    if not (args.directory / "index.html").exists():
+        print(f"{args.directory} 中没有构建结果，请先运行 npm run build 或使用 --build")
+        return 1
+
+    base = "/" + args.base.strip("/")
+
+    class PreviewHandler(SimpleHTTPRequestHandler):
+        def do_GET(self):
+            # 根路径跳转到带前缀的首页
+            if self.path == "/" or self.path == base:
+                self.send_response(302)
+                self.send_header("Location", base + "/")
+                self.end_headers()
+                return
+            super().do_GET()
+
+        def translate_path(self, path):
+            if path.startswith(base + "/"):
+                path = path[len(base):]
+            return super().translate_path(path)
+
+    handler = partial(PreviewHandler, directory=str(args.directory))
+    with ThreadingHTTPServer((args.host, args.port), handler) as server:
+        print(f"正在提供 {args.directory}: http://{args.host}:{args.port}{base}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def cmd_bench(args):
+    """用录制的存档重复运行完整流程（不访问网站），输出耗时统计"""
+    import time
+    import asyncio
+    import tempfile
+    import statistics
+    from metrograph import MetrographScraper
+
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.repeat):
+            scraper = MetrographScraper(
+                concurrency=args.concurrency, replay_path=args.archive,
+                workers=args.workers,
+                base_url=args.base_url,
+                # 只分析第一次运行，避免报告相互覆盖
+                profile_dir=args.profile if i == 0 else None, profile_mode=args.profile_mode
+            )
+            start_time = time.perf_counter()
+            if not asyncio.run(scraper.run(str(Path(tmp) / "movies.json"))):
+                return 1
+            timings.append(time.perf_counter() - start_time)
+
+    films = len(scraper.films_to_scrape())
+    median = statistics.median(timings)
+    print(
+        f"运行 {len(timings)} 次（{films} 部电影）: 最快 {min(timings):.3f} 秒，"
+        f"中位数 {median:.3f} 秒，最慢 {max(timings):.3f} 秒，约 {films / median:.0f} 部电影/秒"
+    )
+    return 0
+
+
+def cmd_standin(args):
+    """启动测试服务器，退出时输出请求统计"""
+    import asyncio
+    from standin_server import StandinCatalogue, StandinServer
+
+    catalogue = StandinCatalogue(
+        films=args.films, days=args.days, screenings_per_film=args.screenings_per_film,
+        sold_out_rate=args.sold_out_rate, seed=args.seed
+    )
+    server = StandinServer(
+        catalogue, latency=args.latency, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, seed=args.seed
+    )
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    print("请求统计: " + "，".join(f"{key} {value}" for key, value in server.stats.items()))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Metrograph 电影爬虫")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scrape = subparsers.add_parser("scrape", help="抓取网站并保存数据")
+    scrape.add_argument("--output", help=f"输出文件（默认 {SCRAPER_JSON_PATH.name}，多场馆时为 venues_movies.json）")
+    scrape.add_argument("--concurrency", type=int, default=8, help="同时抓取的详情页数量")
+    scrape.add_argument("--api", action="store_true", help="记录并直接调用页面加载的场次接口")
+    mode = scrape.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="ARCHIVE", help="抓取时把所有页面录制到存档（.json.gz）")
+    mode.add_argument("--replay", metavar="ARCHIVE", help="从存档回放页面，不访问网站也不启动浏览器")
+    scrape.add_argument("--profile", nargs="?", const="profile_output", metavar="DIR",
+                        help="按阶段输出 cProfile（或内存分配）、火焰图调用栈和事件循环延迟报告（默认目录 profile_output）")
+    scrape.add_argument("--profile-mode", choices=["cpu", "memory"], default="cpu",
+                        help="cpu 统计函数耗时，memory 统计内存分配；两者分开运行以免 tracemalloc 拖慢 cProfile 的计时")
+    scrape.add_argument("--publish", action="store_true", help="保存后复制到前端的 public/data/films.json")
+    scrape.add_argument("--workers", type=int, default=0, metavar="N",
+                        help="使用 N 个进程（各自启动浏览器）并行抓取详情")
+    scrape.add_argument("--queue", metavar="PATH", help="多进程共享的任务队列数据库，默认放在临时目录并在结束后删除；指定时保留以便检查")
+    scrape.add_argument("--base-url", help="覆盖 Metrograph 网址，例如 standin 测试服务器 http://127.0.0.1:8765（回放时默认使用存档中记录的网址）")
+    scrape.add_argument("--venues", nargs="+", metavar="VENUE", help="在一个浏览器中抓取多个场馆，例如 metrograph fixture")
+    scrape.set_defaults(func=cmd_scrape)
+
+    refresh = subparsers.add_parser("refresh-status", help="通过场次接口刷新售票状态，不启动浏览器")
+    refresh.add_argument("--input", default=str(SCRAPER_JSON_PATH), help="要更新的数据文件")
+    refresh.add_argument("--endpoints", default=str(API_ENDPOINTS_PATH), help="scrape --api 发现的接口记录")
+    refresh.add_argument("--concurrency", type=int, default=8, help="同时请求的接口数量")
+    refresh.add_argument("--publish", action="store_true", help="更新后复制到前端的 public/data/films.json")
+    refresh.set_defaults(func=cmd_refresh_status)
+
+    export = subparsers.add_parser("export", help="导出电影数据")
+    export.add_argument("--input", default=str(SCRAPER_JSON_PATH), help="数据文件")
+    export.add_argument("--output", default="-", help="输出文件，- 表示标准输出")
+    export.add_argument("--format", choices=["json", "csv"], default="json")
+    export.add_argument("--compact", action="store_true", help="JSON 不缩进")
+    export.set_defaults(func=cmd_export)
+
+    publish = subparsers.add_parser("publish", help="复制到前端目录，可选上传")
+    publish.add_argument("--input", default=str(SCRAPER_JSON_PATH), help="数据文件")
+    publish.add_argument("--target", default=str(PUBLIC_JSON_PATH), help="前端数据文件")
+    publish.add_argument("--upload", metavar="URL", help="同时 POST 到该地址（密钥读取 METROGRAPH_UPLOAD_KEY）")
+    publish.set_defaults(func=cmd_publish)
+
+    serve = subparsers.add_parser("serve", help="本地预览前端的构建结果")
+    serve.add_argument("--directory", type=Path, default=DIST_DIR, help="构建输出目录")
+    serve.add_argument("--build", action="store_true", help="先运行 npm run build")
+    serve.add_argument("--base", default="/scrapmetrograph", help="与 vite.config.js 的 base 一致的路径前缀")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.set_defaults(func=cmd_serve)
+
+    bench = subparsers.add_parser("bench", help="用录制的存档重复运行完整流程")
+    bench.add_argument("archive", help="scrape --record 录制的存档")
+    bench.add_argument("--repeat", type=int, default=5, help="运行次数")
+    bench.add_argument("--concurrency", type=int, default=8, help="同时处理的详情页数量")
+    bench.add_argument("--workers", type=int, default=0, metavar="N", help="使用 N 个进程抓取详情")
+    bench.add_argument("--profile", metavar="DIR", help="为第一次运行输出性能分析报告")
+    bench.add_argument("--profile-mode", choices=["cpu", "memory"], default="cpu", help="性能分析模式，同 scrape")
+    bench.add_argument("--base-url", help="覆盖存档中记录的网址，只在回放旧版存档时需要")
+    bench.set_defaults(func=cmd_bench)
+
+    standin = subparsers.add_parser("standin", help="启动 Metrograph 结构的本地测试服务器")
+    standin.add_argument("--host", default="127.0.0.1")
+    standin.add_argument("--port", type=int, default=8765)
+    standin.add_argument("--films", type=int, default=80, help="电影数量（目前网站约 80 部）")
+    standin.add_argument("--days", type=int, default=14, help="日历天数")
+    standin.add_argument("--screenings-per-film", type=int, default=3, help="每部电影放映的天数")
+    standin.add_argument("--sold-out-rate", type=float, default=0.2, help="售罄场次的比例")
+    standin.add_argument("--latency", type=float, default=0.0, help="平均响应延迟（秒）")
+    standin.add_argument("--error-rate", type=float, default=0.0, help="返回 500 的请求比例")
+    standin.add_argument("--rate-limit", type=int, default=0, help="每秒最多处理的请求数，超出返回 429；0 表示不限")
+    standin.add_argument("--seed", type=int, default=0, help="随机种子，相同种子生成相同数据")
+    standin.set_defaults(func=cmd_standin)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
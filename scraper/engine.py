@@ -0,0 +1,91 @@
+"""
+多场馆抓取引擎 - 所有场馆共享一个浏览器，每个场馆一个上下文，使用全局并发限制
+每个场馆的结果按 MetrographScraper 的方式整合后加上 venue 字段，保存为统一格式的 JSON
+录制时所有场馆写入同一个存档，回放时各场馆从同一个存档读取
+"""
+
+import sys
+import json
+import time
+import asyncio
+from fetchers import RecordingArchive
+from metrograph import MetrographScraper, start_playwright, launch_browser
+
+
+class VenueEngine:
+    """在一个浏览器中并发抓取多个场馆"""
+
+    def __init__(self, venues, concurrency=8, replay_path=None, record_path=None):
+        self.venues = venues  # 场馆适配器列表
+        self.concurrency = concurrency  # 所有场馆共享的并发数量
+        self.replay_path = replay_path  # 回放页面存档的路径，设置后不启动浏览器
+        self.record_path = record_path  # 录制所有场馆页面的存档路径
+        self.playwright = None
+        self.browser = None
+
+    async def scrape_venue(self, scraper):
+        """抓取一个场馆的日历和详情，返回带 venue 字段的电影列表"""
+        await scraper.scrape_calendar()
+        await scraper.scrape_movie_details()
+        films = scraper.merge_data()
+        for film in films:
+            film["venue"] = scraper.venue.name
+        return films
+
+    async def run(self, filename="venues_movies.json"):
+        """抓取所有场馆并保存统一格式的数据，单个场馆失败不影响其他场馆"""
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        archive = RecordingArchive(self.record_path) if self.record_path else None
+        scrapers = [
+            MetrographScraper(concurrency=self.concurrency, replay_path=self.replay_path, venue=venue)
+            for venue in self.venues
+        ]
+
+        try:
+            if not self.replay_path:
+                self.playwright = await start_playwright()
+                self.browser = await launch_browser(self.playwright)
+            for scraper in scrapers:
+                await scraper.initialize_fetcher(browser=self.browser, semaphore=semaphore, archive=archive)
+
+            results = await asyncio.gather(
+                *(self.scrape_venue(scraper) for scraper in scrapers),
+                return_exceptions=True
+            )
+
+            films = []
+            for scraper, result in zip(scrapers, results):
+                if isinstance(result, Exception):
+                    print(f"抓取场馆 {scraper.venue.name} 时出错: {result}")
+                    continue
+                films.extend(result)
+
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(films, f, indent=2, ensure_ascii=False)
+            print(f"{len(self.venues)} 个场馆的电影数据已保存到 {filename} （共 {len(films)} 部电影）")
+            print(f"总耗时: {time.time() - start_time:.2f} 秒")
+            return all(not isinstance(result, Exception) for result in results)
+        finally:
+            for scraper in scrapers:
+                await scraper.close()
+            # 所有场馆关闭后统一写入一次存档
+            if archive:
+                archive.save()
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+
+
+def main():
+    """兼容单独运行，等同于 python cli.py scrape --venues ...，未指定场馆时抓取所有真实场馆（不含测试场馆）"""
+    from cli import main as cli_main
+    args = sys.argv[1:]
+    if "--venues" not in args:
+        from venues import VENUES
+        args = ["--venues", *(name for name, venue in VENUES.items() if not venue.testing), *args]
+    return cli_main(["scrape", *args])
+
+if __name__ == "__main__":
+    sys.exit(main())
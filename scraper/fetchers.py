@@ -0,0 +1,146 @@
+"""
+页面获取层 - 日历页和详情页都通过同一个 fetch 接口获取
+BrowserFetcher 使用 Playwright 渲染页面，RecordingFetcher 在渲染的同时把页面存档，
+ReplayFetcher 直接从存档读取页面，用于离线开发、性能分析和回归测试
+
+存档同时记录各场馆录制时使用的网址（base_urls），回放时默认使用同样的网址，
+录制测试服务器等非默认网址的存档无需再手动指定 --base-url
+"""
+
+import gzip
+import json
+
+ARCHIVE_VERSION = 1
+
+
+class FetchError(Exception):
+    """页面返回错误状态码"""
+
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+        self.url = url
+
+
+def parse_retry_after(value):
+    """解析 Retry-After 响应头的秒数，缺失或为日期格式时返回 None"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class BrowserFetcher:
+    """使用 Playwright 浏览器上下文渲染页面"""
+
+    def __init__(self, context):
+        self.context = context
+
+    async def fetch(self, url, wait_selector, page=None, prepare=None, finish=None, scroll=False, timeout=30000):
+        """
+        访问页面并返回 {"url", "status", "body"}
+
+        未传入 page 时为本次请求新建页面并在结束后关闭；
+        prepare(page) 在访问前调用，finish() 在关闭页面前等待。
+        状态码为 4xx/5xx 时不等待关键元素，直接返回，并附带 Retry-After 的秒数 retry_after
+        """
+        own_page = page is None
+        if own_page:
+            page = await self.context.new_page()
+        if prepare:
+            prepare(page)
+
+        try:
+            # 访问页面，减少等待条件
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+            if response and response.status >= 400:
+                return {
+                    "url": url,
+                    "status": response.status,
+                    "body": await page.content(),
+                    "retry_after": parse_retry_after(response.headers.get("retry-after"))
+                }
+
+            # 等待页面加载完成关键元素
+            await page.wait_for_selector(wait_selector, timeout=10000)
+
+            if scroll:
+                await page.evaluate("window.scrollBy(0, 200)")
+
+            return {
+                "url": url,
+                "status": response.status if response else 200,
+                "body": await page.content()
+            }
+        finally:
+            if finish:
+                await finish()
+            if own_page:
+                await page.close()
+
+    def close(self):
+        pass
+
+
+class RecordingArchive:
+    """录制的页面和各场馆的网址，多个 RecordingFetcher 可写入同一个存档，由创建者调用 save 写入文件"""
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+        self.pages = {}
+        self.base_urls = {}  # 场馆名 -> 录制时使用的网址
+
+    def save(self):
+        archive = {"version": ARCHIVE_VERSION, "base_urls": self.base_urls, "pages": self.pages}
+        with gzip.open(self.archive_path, 'wt', encoding='utf-8') as f:
+            json.dump(archive, f, ensure_ascii=False)
+        print(f"已录制 {len(self.pages)} 个页面到 {self.archive_path}")
+
+
+class RecordingFetcher:
+    """
+    包装另一个 fetcher，记录获取到的每个页面
+
+    只传入 archive_path 时关闭时写入存档；传入共享的 archive 时（多场馆同时录制）由创建 archive 的一方保存，
+    避免每个场馆关闭时各自写入、后关闭的覆盖先关闭的
+    """
+
+    def __init__(self, inner, archive_path=None, archive=None):
+        self.inner = inner
+        self.owns_archive = archive is None
+        self.archive = archive or RecordingArchive(archive_path)
+        self.pages = self.archive.pages
+        self.base_urls = self.archive.base_urls
+
+    async def fetch(self, url, wait_selector, **kwargs):
+        result = await self.inner.fetch(url, wait_selector, **kwargs)
+        self.pages[url] = {"status": result["status"], "body": result["body"]}
+        return result
+
+    def close(self):
+        """关闭内部 fetcher，存档属于自己时保存存档"""
+        self.inner.close()
+        if self.owns_archive:
+            self.archive.save()
+
+
+class ReplayFetcher:
+    """从录制的存档中读取页面，不启动浏览器"""
+
+    def __init__(self, archive_path):
+        with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
+            archive = json.load(f)
+        if archive.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"不支持的存档版本: {archive.get('version')}")
+        self.pages = archive["pages"]
+        # 早期的存档没有记录网址
+        self.base_urls = archive.get("base_urls", {})
+
+    async def fetch(self, url, wait_selector, **kwargs):
+        page = self.pages.get(url)
+        if page is None:
+            raise LookupError(f"存档中没有页面: {url}")
+        return {"url": url, "status": page["status"], "body": page["body"]}
+
+    def close(self):
+        pass
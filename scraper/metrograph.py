@@ -1,34 +1,101 @@
 import json
-import re
 import os
+import sys
 import time
 import asyncio
+from contextlib import nullcontext
 from datetime import datetime
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from api_capture import ApiCapture
+from fetchers import BrowserFetcher, RecordingFetcher, ReplayFetcher, FetchError
+from profiler import PhaseProfiler
+from publish import PUBLIC_JSON_PATH, publish_file
+from venues import MetrographVenue
+
+# 返回 429 时最多重试的次数，响应没有 Retry-After 时的等待秒数，以及等待秒数的上限
+MAX_THROTTLE_RETRIES = 3
+DEFAULT_RETRY_AFTER = 1.0
+MAX_RETRY_AFTER = 30.0
+
+async def start_playwright():
+    """启动 Playwright，只在需要浏览器时才导入"""
+    from playwright.async_api import async_playwright
+    return await async_playwright().start()
+
+async def launch_browser(playwright):
+    """启动 Firefox 浏览器，减少被识别为爬虫的可能性"""
+    return await playwright.firefox.launch(
+        headless=True,
+        # 添加性能相关参数
+        args=['--disable-gpu', '--disable-dev-shm-usage', '--disable-setuid-sandbox', '--no-sandbox']
+    )
 
 class MetrographScraper:
-    def __init__(self, concurrency=5):
-        self.base_url = "https://metrograph.com"
-        self.calendar_url = "https://metrograph.com/calendar/"
+    def __init__(self, concurrency=5, use_api=False, record_path=None, replay_path=None,
+                 profile_dir=None, publish=False, workers=0, queue_path=None, venue=None,
+                 base_url=None, profile_mode="cpu"):
+        # 场馆适配器提供网址和页面解析规则，默认为 Metrograph；base_url 可指向本地测试服务器
+        self.venue = venue or MetrographVenue(base_url=base_url)
+        self.base_url = self.venue.base_url
+        self.calendar_url = self.venue.calendar_url
         self.movies = []
         self.concurrency = concurrency  # 并发数量
         self.semaphore = None  # 初始化时创建信号量
+        # 启用后记录页面加载的 JSON 接口，已知接口的电影直接请求接口而不渲染页面
+        self.api_capture = ApiCapture() if use_api else None
+        self.previous_films = {}  # 上一次保存的电影数据，用于补全跳过渲染时的详情
+        self.record_path = record_path  # 录制页面存档的路径
+        self.replay_path = replay_path  # 回放页面存档的路径，设置后不启动浏览器
+        self.fetcher = None  # 初始化时创建页面获取器
+        # 按阶段输出性能分析报告，profile_mode 为 cpu（cProfile）或 memory（tracemalloc）
+        self.profiler = PhaseProfiler(profile_dir, mode=profile_mode) if profile_dir else None
+        self.publish = publish  # 保存后是否复制到前端的 public/data 目录
+        self.workers = workers  # 大于 0 时使用多进程抓取详情
+        self.queue_path = queue_path  # 多进程共享的任务队列数据库，未指定时使用临时目录并在结束后删除
+        
+    async def initialize_fetcher(self, browser=None, semaphore=None, archive=None):
+        """
+        初始化页面获取器：回放模式读取存档，否则启动浏览器（可同时录制）
+        
+        传入 browser 和 semaphore 时在共享的浏览器中创建本场馆的上下文，并使用共享的并发限制；
+        传入 archive（RecordingArchive）时把页面录制到多个场馆共享的存档
+        """
+        if self.replay_path:
+            self.fetcher = ReplayFetcher(self.replay_path)
+            self.semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+            self.use_recorded_base_url()
+            return
         
+        if browser:
+            await self.initialize_context(browser, semaphore or asyncio.Semaphore(self.concurrency))
+        else:
+            await self.initialize_browser()
+        self.fetcher = BrowserFetcher(self.context)
+        if self.record_path or archive:
+            self.fetcher = RecordingFetcher(self.fetcher, self.record_path, archive=archive)
+            self.fetcher.base_urls[self.venue.name] = self.base_url
+        
+    def use_recorded_base_url(self):
+        """未指定网址时改用存档录制时的网址，指定了其他网址时保留指定的网址"""
+        recorded = self.fetcher.base_urls.get(self.venue.name)
+        if not recorded or self.base_url != type(self.venue).base_url or recorded == self.base_url:
+            return
+        print(f"使用存档录制时的网址: {recorded}")
+        self.venue.base_url = recorded
+        self.base_url = self.venue.base_url
+        self.calendar_url = self.venue.calendar_url
+
     async def initialize_browser(self):
         """初始化 Playwright 浏览器"""
-        self.playwright = await async_playwright().start()
+        self.playwright = await start_playwright()
+        self.browser = await launch_browser(self.playwright)
         
-        # 使用 Firefox 浏览器，减少被识别为爬虫的可能性
-        self.browser = await self.playwright.firefox.launch(
-            headless=True,
-            # 添加性能相关参数
-            args=['--disable-gpu', '--disable-dev-shm-usage', '--disable-setuid-sandbox', '--no-sandbox']
-        )
+        # 初始化信号量，控制并发
+        await self.initialize_context(self.browser, asyncio.Semaphore(self.concurrency))
         
+    async def initialize_context(self, browser, semaphore):
+        """在浏览器中创建本场馆使用的上下文和页面"""
         # 创建一个具有自定义特性的上下文
-        self.context = await self.browser.new_context(
+        self.context = await browser.new_context(
             viewport={"width": 1280, "height": 800},  # 减小视窗大小，减少资源消耗
             user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36",
             locale="en-US",
@@ -40,8 +107,7 @@ class MetrographScraper:
         # 创建一个新页面
         self.page = await self.context.new_page()
         
-        # 初始化信号量，控制并发
-        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.semaphore = semaphore
         
         # 添加一个更小的随机延迟
         await self.page.route("**/*", self.add_minimal_delay)
@@ -53,93 +119,85 @@ class MetrographScraper:
         await route.continue_()
     
     async def close(self):
-        """关闭浏览器和 Playwright"""
+        """关闭页面获取器、浏览器和 Playwright，可重复调用"""
+        if self.fetcher:
+            self.fetcher.close()
+            self.fetcher = None
         if hasattr(self, 'browser'):
             await self.browser.close()
+        elif hasattr(self, 'context'):
+            # 共享的浏览器由引擎负责关闭，这里只关闭本场馆的上下文
+            await self.context.close()
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
+        for name in ('page', 'context', 'browser', 'playwright'):
+            vars(self).pop(name, None)
         
     async def scrape_calendar(self):
         """使用 Playwright 抓取日历页面，获取电影基本信息和链接"""
         print("正在抓取日历页面...")
         
-        # 访问日历页面，减少等待条件
-        await self.page.goto(self.calendar_url, wait_until="domcontentloaded")
-        
-        # 等待页面加载完成关键元素
-        await self.page.wait_for_selector(".calendar-list-day", timeout=10000)
+        # 访问日历页面并等待关键元素加载完成
+        result = await self.fetch_page(self.calendar_url, self.venue.calendar_selector, page=getattr(self, 'page', None))
         
         # 获取页面内容并解析
-        content = await self.page.content()
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # 查找所有日历日期区块
-        calendar_days = soup.find_all('div', class_='calendar-list-day')
+        content = result["body"]
+        self.movies.extend(self.venue.parse_calendar(content))
         
-        for day in calendar_days:
-            # 获取日期
-            date_elem = day.find('div', class_='date')
-            if not date_elem:
-                continue
-                
-            date_text = date_elem.text.strip()
-            
-            # 查找当天的所有电影条目
-            movie_items = day.find_all('div', class_='item')
-            
-            for item in movie_items:
-                # 提取电影标题和链接
-                title_elem = item.find('a', class_='title')
-                if not title_elem:
-                    continue
-                    
-                title = title_elem.text.strip()
-                detail_url = title_elem.get('href')
-                
-                if not detail_url:
-                    continue
-                    
-                # 确保 URL 是绝对路径
-                if not detail_url.startswith('http'):
-                    detail_url = urljoin(self.base_url, detail_url)
-                
-                # 提取放映时间
-                showtimes = []
-                for time_link in item.find_all('a'):
-                    if 'title' not in time_link.attrs or time_link.attrs.get('class') == ['title']:
-                        continue
-                    
-                    time_text = time_link.text.strip()
-                    ticket_status = "Available"
-                    
-                    if time_link.get('class') and 'sold_out' in time_link.get('class'):
-                        ticket_status = "Sold Out"
-                        
-                    showtimes.append({
-                        "time": time_text,
-                        "status": ticket_status
-                    })
-                
-                # 创建电影基本信息
-                movie_info = {
-                    "title": title,
-                    "detail_url": detail_url,
-                    "date": date_text,
-                    "showtimes": showtimes,
-                    "vista_film_id": self.extract_film_id(detail_url)
-                }
-                
-                self.movies.append(movie_info)
-                
         print(f"找到 {len(self.movies)} 个电影放映场次")
         return True
     
+    async def fetch_page(self, url, wait_selector, **kwargs):
+        """获取页面；429 时按 Retry-After（最多 MAX_RETRY_AFTER 秒）等待后重试，其他错误状态码抛出 FetchError"""
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            result = await self.fetcher.fetch(url, wait_selector, **kwargs)
+            if result["status"] == 429 and attempt < MAX_THROTTLE_RETRIES:
+                delay = result.get("retry_after")
+                # 不信任服务器给出的过长等待时间
+                delay = DEFAULT_RETRY_AFTER if delay is None else min(delay, MAX_RETRY_AFTER)
+                print(f"{url} 请求过于频繁，{delay:g} 秒后重试")
+                await asyncio.sleep(delay)
+                continue
+            if result["status"] >= 400:
+                raise FetchError(result["status"], url)
+            return result
+
+    def load_previous_films(self, filename="metrograph_movies.json"):
+        """读取上一次保存的电影数据，按电影 ID 索引"""
+        if not os.path.exists(filename):
+            return
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                self.previous_films = {film["id"]: film for film in json.load(f) if film.get("id")}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"读取上一次的电影数据失败: {e}")
+    
+    async def scrape_single_movie_from_api(self, movie):
+        """直接请求场次接口获取放映信息，其余详情沿用上一次的数据；失败时返回 None"""
+        film_id = movie.get("vista_film_id")
+        previous = self.previous_films.get(film_id)
+        if not previous or not self.api_capture.has_endpoint() or not hasattr(self, 'context'):
+            return None
+        
+        screenings = await self.api_capture.fetch_direct(self.context.request, film_id)
+        if not screenings:
+            return None
+        
+        print(f"通过接口获取 {movie['title']} 的场次")
+        details = {
+            key: previous[key]
+            for key in ("poster_url", "director", "year", "runtime", "synopsis")
+            if previous.get(key)
+        }
+        details["detail_url"] = movie["detail_url"]
+        details["all_screenings"] = screenings
+        details["vista_film_id"] = film_id
+        details["title"] = movie["title"]
+        return details
+    
     def extract_film_id(self, url):
         """从 URL 中提取电影 ID"""
-        match = re.search(r'vista_film_id=(\d+)', url)
-        if match:
-            return match.group(1)
-        return None
+        return self.venue.extract_film_id(url)
     
     async def scrape_single_movie(self, movie, scraped_ids):
         """抓取单个电影详情页的方法，用于并发执行"""
@@ -150,214 +208,30 @@ class MetrographScraper:
             if not film_id or film_id in scraped_ids:
                 return None
                 
+            # 已知场次接口时直接请求接口，跳过页面渲染
+            if self.api_capture:
+                details = await self.scrape_single_movie_from_api(movie)
+                if details:
+                    scraped_ids.add(film_id)
+                    return details
+            
             print(f"正在抓取 {movie['title']} 的详情")
             
-            # 创建新的页面用于此次请求
-            page = await self.context.new_page()
-            details = {}
+            # 记录页面加载的 JSON 响应，发现场次接口；处理完已收到的响应后再关闭页面
+            prepare = finish = None
+            if self.api_capture:
+                prepare = lambda page: self.api_capture.attach(page, film_id)
+                finish = self.api_capture.drain
             
             try:
-                # 访问电影详情页，减少等待条件
-                await page.goto(movie["detail_url"], wait_until="domcontentloaded", timeout=15000)
-                
-                # 等待页面加载完成关键元素
-                await page.wait_for_selector(".movie-info", timeout=10000)
-                
-                # 简化滚动行为
-                await page.evaluate("window.scrollBy(0, 200)")
-                
-                # 获取页面内容并解析
-                content = await page.content()
-                soup = BeautifulSoup(content, 'html.parser')
+                # 访问电影详情页，等待关键元素并简单滚动
+                result = await self.fetch_page(
+                    movie["detail_url"], self.venue.detail_selector,
+                    prepare=prepare, finish=finish, scroll=True, timeout=15000
+                )
                 
-                # 提取电影详情
-                # 获取海报图片 URL
-                poster_elem = soup.select_one('.movie-image img')
-                if poster_elem and 'src' in poster_elem.attrs:
-                    details["poster_url"] = poster_elem['src']
-                    
-                # 获取导演
-                director_elem = soup.select_one('.movie-info h5:-soup-contains("Director:")')
-                if director_elem:
-                    director_text = director_elem.text.strip()
-                    if "Director:" in director_text:
-                        details["director"] = director_text.replace("Director:", "").strip()
-                
-                # 获取年份、时长等信息
-                info_elem = soup.select_one('.movie-info h5:nth-of-type(2)')
-                if info_elem:
-                    info_text = info_elem.text.strip()
-                    # 尝试分离年份和时长
-                    info_parts = info_text.split('/')
-                    if len(info_parts) >= 2:
-                        details["year"] = info_parts[0].strip()
-                        runtime_part = info_parts[1].strip()
-                        if "min" in runtime_part:
-                            details["runtime"] = runtime_part
-                
-                # 获取简介 - 完全重写以更好地处理HTML结构
-                synopsis = ""
-                
-                # 方法1: 尝试从 .movie-info > p > p 结构获取简介
-                synopsis_container = soup.select_one('.movie-info > p')
-                if synopsis_container:
-                    # 首先尝试找到嵌套的p标签
-                    nested_ps = synopsis_container.find_all('p', recursive=True)
-                    
-                    if nested_ps and len(nested_ps) > 0:
-                        # 使用第一个非空p标签的内容作为简介
-                        for p in nested_ps:
-                            if p.text.strip() and not p.find('a', class_='back-link'):
-                                synopsis = p.text.strip()
-                                break
-                    
-                    # 如果通过嵌套p标签没找到，尝试直接使用内容
-                    if not synopsis and synopsis_container.text.strip():
-                        text = synopsis_container.text.strip()
-                        if "Back to films" in text:
-                            text = text.replace("Back to films", "").strip()
-                        synopsis = text
-                
-                # 方法2: 尝试从 .fl-module-content p 获取简介
-                if not synopsis:
-                    module_content = soup.select_one('.fl-module-content')
-                    if module_content:
-                        paragraphs = module_content.select('p')
-                        for p in paragraphs:
-                            if p.text.strip() and 'back-link' not in str(p):
-                                synopsis = p.text.strip()
-                                break
-                
-                # 方法3: 尝试广泛搜索任何可能包含简介的元素
-                if not synopsis:
-                    all_paras = soup.select('p')
-                    for p in all_paras:
-                        # 排除菜单、链接等明显不是简介的元素
-                        if len(p.text.strip()) > 100 and not p.find('a', class_='back-link'):
-                            synopsis = p.text.strip()
-                            break
-                
-                if synopsis:
-                    details["synopsis"] = synopsis
-                
-                # 保存详情页链接
-                details["detail_url"] = movie["detail_url"]
-                
-                # 获取所有放映日期
-                screening_days = []
-                
-                # 尝试从日期选择器中获取日期
-                day_selector = soup.select('.film_day_chooser li a')
-                if day_selector:
-                    # 有日期选择器的情况
-                    for day_elem in day_selector:
-                        if 'data-day' in day_elem.attrs:
-                            day_text = day_elem.text.strip()
-                            day_id = day_elem['data-day']
-                            
-                            # 查找对应日期的放映时间
-                            day_div = soup.select_one(f'#day_{day_id}')
-                            if day_div:
-                                showtimes = []
-                                # 查找所有链接（包括已售罄的场次）
-                                time_links = day_div.select('a')
-                                for time_link in time_links:
-                                    time_text = time_link.text.strip()
-                                    ticket_status = "Available"
-                                    
-                                    # 检查是否已售罄
-                                    if 'sold_out' in time_link.get('class', []):
-                                        ticket_status = "Sold Out"
-                                    
-                                    # 确保时间文本不为空且不包含不相关的文本
-                                    if time_text and ":" in time_text and "Buy" not in time_text:
-                                        showtimes.append({
-                                            "time": time_text,
-                                            "status": ticket_status
-                                        })
-                                
-                                if showtimes:  # 只添加有放映时间的日期
-                                    screening_days.append({
-                                        "date": day_text,
-                                        "showtimes": showtimes
-                                    })
-                else:
-                    # 处理没有日期选择器的情况（例如 Titane 案例）
-                    # 尝试从 date_picker_holder 直接获取日期
-                    date_holder = soup.select_one('.date_picker_holder')
-                    if date_holder:
-                        day_text = date_holder.text.strip()
-                        if not day_text and date_holder.select_one('a'):
-                            day_text = date_holder.select_one('a').text.strip()
-                        
-                        if day_text:
-                            # 尝试找到对应的放映时间容器
-                            # 查找所有 film_day 类的 div
-                            day_divs = soup.select('.film_day')
-                            for day_div in day_divs:
-                                # 检查 day_div 是否有标识日期的元素
-                                day_title = day_div.select_one('h5.sr-only')
-                                current_day_text = day_title.text.strip() if day_title else ""
-                                
-                                # 如果找到匹配的日期或只有一个放映日 div
-                                if not current_day_text or current_day_text == day_text or len(day_divs) == 1:
-                                    showtimes = []
-                                    
-                                    # 处理所有链接，包括已售罄的
-                                    time_links = day_div.select('a')
-                                    for time_link in time_links:
-                                        time_text = time_link.text.strip()
-                                        ticket_status = "Available"
-                                        
-                                        # 检查是否已售罄
-                                        if 'sold_out' in time_link.get('class', []):
-                                            ticket_status = "Sold Out"
-                                        
-                                        # 确保时间文本是有效的
-                                        if time_text and ":" in time_text and "Buy" not in time_text:
-                                            showtimes.append({
-                                                "time": time_text,
-                                                "status": ticket_status
-                                            })
-                                    
-                                    if showtimes:  # 只添加有放映时间的日期
-                                        screening_days.append({
-                                            "date": day_text,
-                                            "showtimes": showtimes
-                                        })
-                    
-                    # 如果仍然没有找到放映时间，尝试直接从 film_day div 中获取
-                    if not screening_days:
-                        day_divs = soup.select('.film_day')
-                        for day_div in day_divs:
-                            day_title = day_div.select_one('h5.sr-only')
-                            if day_title and day_title.text.strip():
-                                day_text = day_title.text.strip()
-                                showtimes = []
-                                
-                                # 处理所有链接，包括已售罄的
-                                time_links = day_div.select('a')
-                                for time_link in time_links:
-                                    time_text = time_link.text.strip()
-                                    ticket_status = "Available"
-                                    
-                                    if 'sold_out' in time_link.get('class', []):
-                                        ticket_status = "Sold Out"
-                                    
-                                    if time_text and ":" in time_text and "Buy" not in time_text:
-                                        showtimes.append({
-                                            "time": time_text,
-                                            "status": ticket_status
-                                        })
-                                
-                                if showtimes:
-                                    screening_days.append({
-                                        "date": day_text,
-                                        "showtimes": showtimes
-                                    })
-                
-                if screening_days:
-                    details["all_screenings"] = screening_days
+                # 解析页面内容，提取电影详情
+                details = self.venue.parse_details(result["body"], movie)
                 
                 # 标记为已抓取并返回结果
                 scraped_ids.add(film_id)
@@ -369,9 +243,6 @@ class MetrographScraper:
             except Exception as e:
                 print(f"抓取 {movie['title']} 详情失败: {e}")
                 return None
-            finally:
-                # 关闭此次请求使用的页面
-                await page.close()
         
     async def scrape_movie_details(self):
         """并发访问每部电影的详情页，获取更多信息"""
@@ -380,13 +251,7 @@ class MetrographScraper:
         # 跟踪已经抓取过的电影 ID，使用集合以避免重复
         scraped_ids = set()
         
-        # 准备要抓取的电影列表 (去重)
-        films_to_scrape = {}
-        for movie in self.movies:
-            film_id = movie.get("vista_film_id")
-            if film_id and film_id not in films_to_scrape:
-                films_to_scrape[film_id] = movie
-        
+        films_to_scrape = self.films_to_scrape()
         print(f"需要抓取 {len(films_to_scrape)} 部独特电影的详情")
         
         # 创建并发任务
@@ -397,8 +262,42 @@ class MetrographScraper:
         
         # 并发执行所有任务并收集结果
         results = await asyncio.gather(*tasks)
+        self.apply_details(results)
+        
+        print(f"成功抓取了 {len(scraped_ids)} 部电影的详情")
+        
+    async def scrape_movie_details_sharded(self):
+        """多进程抓取电影详情：工作进程通过本地队列领取电影，结果在本进程整合"""
+        import tempfile
+        from workers import scrape_details_sharded
+        
+        # 日历已抓取完毕，先关闭本进程的浏览器，详情阶段只保留工作进程的浏览器
+        await self.close()
+        
+        print(f"正在使用 {self.workers} 个工作进程抓取电影详情...")
+        films_to_scrape = self.films_to_scrape()
+        print(f"需要抓取 {len(films_to_scrape)} 部独特电影的详情")
         
-        # 处理结果
+        with tempfile.TemporaryDirectory(prefix="metrograph-queue-") as tmp:
+            results = await scrape_details_sharded(
+                films_to_scrape, workers=self.workers,
+                db_path=self.queue_path or os.path.join(tmp, "work_queue.sqlite3"),
+                concurrency=self.concurrency, replay_path=self.replay_path, base_url=self.base_url
+            )
+        self.apply_details(results)
+        print(f"成功抓取了 {len(results)} 部电影的详情")
+        
+    def films_to_scrape(self):
+        """准备要抓取的电影列表 (按电影 ID 去重)"""
+        films_to_scrape = {}
+        for movie in self.movies:
+            film_id = movie.get("vista_film_id")
+            if film_id and film_id not in films_to_scrape:
+                films_to_scrape[film_id] = movie
+        return films_to_scrape
+        
+    def apply_details(self, results):
+        """把抓取到的详情更新到该电影的所有条目"""
         for result in results:
             if result:
                 film_id = result.get("vista_film_id")
@@ -416,11 +315,13 @@ class MetrographScraper:
                         if "all_screenings" not in result:
                             m["date"] = original_date
                             m["showtimes"] = original_showtimes
-        
-        print(f"成功抓取了 {len(scraped_ids)} 部电影的详情")
             
     def save_data(self, filename="metrograph_movies.json"):
         """将抓取的数据保存为 JSON 文件，按电影整合所有放映场次"""
+        self.write_data(self.merge_data(), filename)
+        
+    def merge_data(self):
+        """按电影整合所有放映场次，返回按标题排序的电影列表"""
         # 按电影 ID 整合数据
         unique_films = {}
         
@@ -509,20 +410,47 @@ class MetrographScraper:
         
         # 按标题排序
         films_list.sort(key=lambda x: x["title"])
+        return films_list
         
-        # 保存整合后的数据
+    def write_data(self, films_list, filename="metrograph_movies.json"):
+        """保存整合后的数据"""
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(films_list, f, indent=2, ensure_ascii=False)
         print(f"整合后的电影数据已保存到 {filename} （共 {len(films_list)} 部电影）")
         
-    async def run(self):
-        """运行完整的抓取过程"""
+    def publish_data(self, filename="metrograph_movies.json", target_path=PUBLIC_JSON_PATH):
+        """将保存的数据复制到前端项目的 public/data 目录"""
+        publish_file(filename, target_path)
+        
+    def phase(self, name):
+        """开启性能分析时统计该阶段，否则不做任何事"""
+        return self.profiler.phase(name) if self.profiler else nullcontext()
+        
+    async def run(self, filename="metrograph_movies.json"):
+        """运行完整的抓取过程，结果保存到 filename"""
         try:
             start_time = time.time()
-            await self.initialize_browser()
-            await self.scrape_calendar()
-            await self.scrape_movie_details()
-            self.save_data()
+            if self.profiler:
+                self.profiler.start()
+            await self.initialize_fetcher()
+            if self.api_capture:
+                self.load_previous_films(filename)
+            with self.phase("calendar"):
+                await self.scrape_calendar()
+            with self.phase("details"):
+                if self.workers:
+                    await self.scrape_movie_details_sharded()
+                else:
+                    await self.scrape_movie_details()
+            if self.api_capture:
+                self.api_capture.save()
+            with self.phase("merge"):
+                films_list = self.merge_data()
+            with self.phase("save"):
+                self.write_data(films_list, filename)
+            if self.publish:
+                with self.phase("publish"):
+                    self.publish_data(filename)
             end_time = time.time()
             print(f"总耗时: {end_time - start_time:.2f} 秒")
             return True
@@ -531,11 +459,13 @@ class MetrographScraper:
             return False
         finally:
             await self.close()
+            if self.profiler:
+                self.profiler.stop()
             
-async def main():
-    # 可以调整并发数量，默认是 5
-    scraper = MetrographScraper(concurrency=8)
-    await scraper.run()
+def main():
+    """兼容旧的入口，等同于 python cli.py scrape"""
+    from cli import main as cli_main
+    return cli_main(["scrape", *sys.argv[1:]])
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(main())
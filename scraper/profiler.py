@@ -0,0 +1,189 @@
+"""
+性能分析 - 为抓取流程的每个阶段（calendar、details、merge、save、publish）生成报告
+
+两种模式分开运行，避免相互干扰（tracemalloc 会拦截每次内存分配，在 bs4 等分配密集的代码上
+使 cProfile 的耗时增加数倍，热点报告失去意义）：
+  cpu     （默认）cProfile 统计每个函数的耗时，不统计内存
+  memory  tracemalloc 统计内存变化、峰值和分配最多的代码行，不运行 cProfile
+
+输出文件：
+  <phase>.prof / <phase>.txt  cProfile 统计（cpu 模式；二进制可用 snakeviz 等工具查看，文本为按累计耗时排序的前几十项）
+  allocations.txt              每个阶段新增内存最多的代码行（memory 模式）
+  stacks.collapsed             采样得到的折叠调用栈，可直接交给 flamegraph.pl / speedscope 生成火焰图
+  summary.txt                  各阶段耗时、内存变化、峰值以及事件循环延迟，首行注明生成报告的模式
+
+事件循环延迟按时间段记录：每次检测从 sleep 开始到实际唤醒之间超出的部分即循环被阻塞的时间段，
+按与各阶段运行时间的重叠分摊到阶段上。merge、save 等同步阶段不会让出事件循环，
+其阻塞在阶段结束后下一次唤醒时（或 stop 时）记录，同样计入该阶段
+"""
+
+import os
+import sys
+import time
+import asyncio
+import cProfile
+import pstats
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+MODES = ("cpu", "memory")
+
+
+class PhaseProfiler:
+    """按阶段收集 cProfile、tracemalloc、调用栈采样和事件循环延迟"""
+
+    def __init__(self, output_dir="profile_output", mode="cpu", sample_interval=0.005, lag_interval=0.01, lag_threshold=0.05):
+        if mode not in MODES:
+            raise ValueError(f"未知的性能分析模式: {mode}（可选: {', '.join(MODES)}）")
+        self.output_dir = Path(output_dir)
+        self.mode = mode  # cpu 使用 cProfile，memory 使用 tracemalloc
+        self.sample_interval = sample_interval  # 调用栈采样间隔（秒）
+        self.lag_interval = lag_interval  # 事件循环延迟检测间隔（秒）
+        self.lag_threshold = lag_threshold  # 超过此延迟视为协程中存在阻塞调用（秒）
+        self.current_phase = None
+        self.phases = {}  # 阶段名 -> 统计结果
+        self.stacks = Counter()  # 折叠调用栈 -> 采样次数
+        self.stalls = []  # 事件循环被阻塞的时间段 (开始, 结束)
+        self.tick_start = None  # 当前这次延迟检测 sleep 开始的时间
+        self.thread_id = None
+        self.stop_event = threading.Event()
+        self.sampler = None
+        self.monitor = None
+
+    def start(self):
+        """开始调用栈采样（memory 模式同时记录内存分配），在事件循环中调用时同时检测循环延迟"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.mode == "memory":
+            tracemalloc.start()
+        self.thread_id = threading.get_ident()
+        self.sampler = threading.Thread(target=self.sample_stacks, daemon=True)
+        self.sampler.start()
+        try:
+            self.monitor = asyncio.get_running_loop().create_task(self.monitor_loop())
+        except RuntimeError:
+            self.monitor = None
+
+    def stop(self):
+        """停止采集并写出报告"""
+        self.stop_event.set()
+        if self.sampler:
+            self.sampler.join()
+        if self.monitor:
+            # 最后的同步阶段之后事件循环可能尚未唤醒检测任务，补记尚未结束的阻塞
+            if self.tick_start is not None:
+                self.record_stall(self.tick_start, time.perf_counter())
+            self.monitor.cancel()
+        if self.mode == "memory":
+            tracemalloc.stop()
+        self.write_reports()
+        print(f"性能分析报告（{self.mode} 模式）已保存到 {self.output_dir}")
+
+    @contextmanager
+    def phase(self, name):
+        """统计一个阶段，可包裹同步代码或 await 调用；内存快照在计时之外获取"""
+        profile = cProfile.Profile() if self.mode == "cpu" else None
+        if self.mode == "memory":
+            before = self.take_snapshot()
+            tracemalloc.reset_peak()
+        self.current_phase = name
+        start_time = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            elapsed = time.perf_counter() - start_time
+            self.current_phase = None
+            stats = {"start": start_time, "end": start_time + elapsed, "elapsed": elapsed, "profile": profile}
+            if self.mode == "memory":
+                stats["memory"], stats["peak"] = tracemalloc.get_traced_memory()
+                stats["allocations"] = self.take_snapshot().compare_to(before, "lineno")
+            self.phases[name] = stats
+
+    def take_snapshot(self):
+        """获取内存快照，排除 tracemalloc 和本模块自身的分配"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def sample_stacks(self):
+        """后台线程：定时采样主线程调用栈，按阶段折叠计数"""
+        while not self.stop_event.wait(self.sample_interval):
+            phase = self.current_phase
+            frame = sys._current_frames().get(self.thread_id)
+            if phase is None or frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name}@{os.path.basename(code.co_filename)}:{code.co_firstlineno}")
+                frame = frame.f_back
+            self.stacks[";".join([phase] + stack[::-1])] += 1
+
+    async def monitor_loop(self):
+        """定时 sleep 并测量实际唤醒的延迟，延迟大说明协程中存在阻塞调用"""
+        while True:
+            self.tick_start = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self.record_stall(self.tick_start, time.perf_counter())
+
+    def record_stall(self, tick_start, woke):
+        """记录应唤醒时间到实际唤醒时间之间事件循环被阻塞的时间段"""
+        expected = tick_start + self.lag_interval
+        if woke > expected:
+            self.stalls.append((expected, woke))
+
+    def phase_lags(self, name):
+        """阶段内每段阻塞的时长（秒），只计算与阶段运行时间重叠的部分，按从小到大排序"""
+        stats = self.phases[name]
+        lags = []
+        for start, end in self.stalls:
+            overlap = min(end, stats["end"]) - max(start, stats["start"])
+            if overlap > 0:
+                lags.append(overlap)
+        return sorted(lags)
+
+    def write_reports(self):
+        """写出当前模式的统计文件、折叠调用栈和汇总"""
+        for name, stats in self.phases.items():
+            if not stats["profile"]:
+                continue
+            stats["profile"].dump_stats(str(self.output_dir / f"{name}.prof"))
+            with open(self.output_dir / f"{name}.txt", 'w', encoding='utf-8') as f:
+                pstats.Stats(stats["profile"], stream=f).sort_stats("cumulative").print_stats(40)
+
+        with open(self.output_dir / "stacks.collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        if self.mode == "memory":
+            with open(self.output_dir / "allocations.txt", 'w', encoding='utf-8') as f:
+                for name, stats in self.phases.items():
+                    f.write(f"=== {name} ===\n")
+                    for diff in stats["allocations"][:15]:
+                        f.write(f"{diff}\n")
+                    f.write("\n")
+
+        with open(self.output_dir / "summary.txt", 'w', encoding='utf-8') as f:
+            if self.mode == "memory":
+                f.write("# mode: memory（tracemalloc 统计内存；耗时和事件循环延迟包含 tracemalloc 的开销，热点请使用 cpu 模式）\n")
+            else:
+                f.write("# mode: cpu（cProfile 统计函数耗时；内存未统计，请使用 memory 模式）\n")
+            f.write(f"{'phase':<10} {'elapsed(s)':>10} {'memory(KB)':>11} {'peak(KB)':>10} {'lag max(ms)':>12} {'lag p99(ms)':>12} {'blocked':>8}\n")
+            for name, stats in self.phases.items():
+                lags = self.phase_lags(name)
+                lag_max = lags[-1] * 1000 if lags else 0.0
+                lag_p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000 if lags else 0.0
+                blocked = sum(1 for lag in lags if lag > self.lag_threshold)
+                memory = f"{stats['memory'] / 1024:.1f}" if "memory" in stats else "-"
+                peak = f"{stats['peak'] / 1024:.1f}" if "peak" in stats else "-"
+                f.write(
+                    f"{name:<10} {stats['elapsed']:>10.3f} {memory:>11} {peak:>10} "
+                    f"{lag_max:>12.1f} {lag_p99:>12.1f} {blocked:>8}\n"
+                )
@@ -0,0 +1,58 @@
+"""
+发布数据 - 把抓取结果复制到前端项目的 public/data 目录，或上传到服务器
+只依赖标准库（上传时才导入 requests），供 cron 中的轻量命令使用
+"""
+
+import os
+import json
+import shutil
+from pathlib import Path
+
+SCRAPER_DIR = Path(__file__).parent
+
+# 爬虫输出的数据文件
+SCRAPER_JSON_PATH = SCRAPER_DIR / 'metrograph_movies.json'
+
+# 前端项目使用的数据文件
+PUBLIC_JSON_PATH = SCRAPER_DIR.parent / 'public' / 'data' / 'films.json'
+
+# 前端构建输出（npm run build），即 CI 部署的目录
+DIST_DIR = SCRAPER_DIR.parent / 'dist'
+
+# scrape --api 发现的场次接口，refresh-status 从这里读取
+API_ENDPOINTS_PATH = SCRAPER_DIR / 'api_endpoints.json'
+
+
+def publish_file(source_path=SCRAPER_JSON_PATH, target_path=PUBLIC_JSON_PATH):
+    """复制数据文件到前端目录，返回电影数量；源文件不是有效 JSON 时抛出 ValueError"""
+    source_path = Path(source_path)
+    target_path = Path(target_path)
+
+    # 先校验，避免把损坏的数据发布到前端
+    with open(source_path, 'r', encoding='utf-8') as f:
+        try:
+            films = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{source_path} 不是有效的 JSON: {e}") from e
+
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(source_path, target_path)
+    print(f"已将数据复制到 {target_path} （共 {len(films)} 部电影）")
+    return len(films)
+
+
+def upload_file(source_path, upload_url, api_key=None):
+    """将数据文件 POST 到服务器，api_key 默认读取环境变量 METROGRAPH_UPLOAD_KEY"""
+    import requests
+
+    api_key = api_key or os.environ.get("METROGRAPH_UPLOAD_KEY")
+    with open(source_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+
+    response = requests.post(upload_url, json=data, headers=headers, timeout=30)
+    response.raise_for_status()
+    print(f"已上传 {len(data)} 部电影到 {upload_url}")
@@ -23,7 +23,7 @@ python3 -m playwright install firefox
 
 # 运行爬虫
 echo "正在运行 Metrograph 爬虫..."
-python3 metrograph.py
+python3 cli.py scrape
 
 # 检查爬取是否成功
 if [ ! -f "metrograph_movies.json" ]; then
@@ -33,7 +33,7 @@ fi
 
 # 处理数据用于 React 应用
 echo "正在处理数据用于 React 应用..."
-python3 data_processor.py
+python3 cli.py publish || exit 1
 
 echo "========================================"
 echo "爬取完成!"
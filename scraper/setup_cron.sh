@@ -13,11 +13,11 @@ pip install -r "$SCRIPT_DIR/requirements.txt" > /dev/null
 LOG_FILE="$SCRIPT_DIR/cron_log.txt"
 
 # 创建cron任务内容
-# 使用simple_scraper.py作为主要更新脚本
-CRON_JOB="0 3 * * * cd $SCRIPT_DIR && /usr/bin/python $SCRIPT_DIR/simple_scraper.py >> $LOG_FILE 2>&1"
+# 使用 cli.py publish 作为主要更新脚本（只复制数据，不加载浏览器）
+CRON_JOB="0 3 * * * cd $SCRIPT_DIR && /usr/bin/python $SCRIPT_DIR/cli.py publish >> $LOG_FILE 2>&1"
 
 # 检查是否已存在相同的cron任务
-EXISTING_CRON=$(crontab -l 2>/dev/null | grep -F "$SCRIPT_DIR/simple_scraper.py")
+EXISTING_CRON=$(crontab -l 2>/dev/null | grep -F "$SCRIPT_DIR/cli.py publish")
 
 if [ -z "$EXISTING_CRON" ]; then
     # 添加新的cron任务
@@ -33,7 +33,7 @@ fi
 
 # 创建一个立即执行的脚本
 echo "#!/bin/bash" > "$SCRIPT_DIR/run_now.sh"
-echo "cd $SCRIPT_DIR && python $SCRIPT_DIR/simple_scraper.py" >> "$SCRIPT_DIR/run_now.sh"
+echo "cd $SCRIPT_DIR && python $SCRIPT_DIR/cli.py publish" >> "$SCRIPT_DIR/run_now.sh"
 chmod +x "$SCRIPT_DIR/run_now.sh"
 
 echo ""
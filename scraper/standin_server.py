@@ -0,0 +1,213 @@
+"""
+Metrograph 测试服务器 - 生成与 metrograph.com 结构相同的 /calendar/ 和 /film/?vista_film_id=… 页面
+页面使用 scrape_calendar / scrape_single_movie 依赖的类名（calendar-list-day、movie-info、film_day_chooser、sold_out），
+电影数量、天数、延迟、错误率和限流均可配置，配合 scrape --base-url 做端到端的吞吐、内存和失败测试
+
+只依赖标准库（asyncio），同样的 seed 总是生成同样的数据
+"""
+
+import time
+import random
+import signal
+import asyncio
+from datetime import date, timedelta
+from html import escape
+from urllib.parse import urlsplit, parse_qs
+
+# 生成的电影 ID 起始值，与真实 ID 的长度一致
+FILM_ID_BASE = 9000000000
+
+SHOWTIMES = ["1:00pm", "3:30pm", "4:00pm", "6:15pm", "7:00pm", "9:15pm", "9:30pm"]
+
+DIRECTORS = ["Edward Yang", "Hou Hsiao-hsien", "Agnès Varda", "Jacques Tati", "Chantal Akerman", "Yasujirō Ozu"]
+
+STATUS_TEXT = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+def format_date(day):
+    """与网站一致的日期格式，例如 Friday April 4"""
+    return f"{day:%A} {day:%B} {day.day}"
+
+
+class StandinCatalogue:
+    """按 seed 生成的电影和放映安排"""
+
+    def __init__(self, films=80, days=14, screenings_per_film=3, sold_out_rate=0.2, seed=0, start_date=None):
+        self.start_date = start_date or date.today()
+        self.days = [format_date(self.start_date + timedelta(days=i)) for i in range(days)]
+        self.films = {}
+        rng = random.Random(seed)
+        for i in range(films):
+            film_id = str(FILM_ID_BASE + i)
+            # 每部电影在若干天放映，每天一到两场
+            screenings = {}
+            for day in sorted(rng.sample(range(days), min(screenings_per_film, days))):
+                times = sorted(rng.sample(range(len(SHOWTIMES)), rng.randint(1, 2)))
+                screenings[self.days[day]] = [
+                    (SHOWTIMES[t], rng.random() < sold_out_rate) for t in times
+                ]
+            self.films[film_id] = {
+                "title": f"Synthetic Film {i + 1}",
+                "director": rng.choice(DIRECTORS),
+                "year": str(rng.randint(1930, 2024)),
+                "runtime": f"{rng.randint(70, 180)}min",
+                "synopsis": f"Synthetic Film {i + 1} is a generated stand-in used for load testing. " * 3,
+                "screenings": screenings,
+            }
+        self.calendar_html = self.render_calendar()
+
+    def showtime_links(self, showtimes, calendar=False):
+        links = []
+        for time_text, sold_out in showtimes:
+            css = ' class="sold_out"' if sold_out else ''
+            # 日历页的场次链接带 title 属性
+            title = ' title="Buy tickets"' if calendar else ''
+            links.append(f'<a href="/checkout/"{title}{css}>{time_text}</a>')
+        return "".join(links)
+
+    def render_calendar(self):
+        """日历页：每天一个 calendar-list-day，每部电影一个 item"""
+        parts = ['<html><body><div class="calendar-list">']
+        for day in self.days:
+            parts.append(f'<div class="calendar-list-day"><div class="date">{day}</div>')
+            for film_id, film in self.films.items():
+                showtimes = film["screenings"].get(day)
+                if not showtimes:
+                    continue
+                parts.append(
+                    f'<div class="item"><a class="title" href="/film/?vista_film_id={film_id}">{escape(film["title"])}</a>'
+                    f'{self.showtime_links(showtimes, calendar=True)}</div>'
+                )
+            parts.append('</div>')
+        parts.append('</div></body></html>')
+        return "".join(parts)
+
+    def render_film(self, film_id):
+        """详情页：海报、导演、年份/时长、简介和带 film_day_chooser 的放映日期"""
+        film = self.films.get(film_id)
+        if film is None:
+            return None
+        chooser = []
+        days = []
+        for i, (day, showtimes) in enumerate(film["screenings"].items()):
+            chooser.append(f'<li><a href="#" data-day="{i}">{day}</a></li>')
+            days.append(f'<div class="film_day" id="day_{i}">{self.showtime_links(showtimes)}</div>')
+        return (
+            '<html><body>'
+            f'<div class="movie-image"><img src="/posters/{film_id}.jpg"></div>'
+            '<div class="movie-info">'
+            f'<h3>{escape(film["title"])}</h3>'
+            f'<h5>Director: {escape(film["director"])}</h5>'
+            f'<h5>{film["year"]} / {film["runtime"]}</h5>'
+            f'<p>{escape(film["synopsis"])}</p>'
+            '</div>'
+            f'<ul class="film_day_chooser">{"".join(chooser)}</ul>'
+            f'{"".join(days)}'
+            '</body></html>'
+        )
+
+
+class StandinServer:
+    """asyncio HTTP 服务器，可模拟延迟、随机错误和限流"""
+
+    def __init__(self, catalogue, latency=0.0, jitter=0.5, error_rate=0.0, rate_limit=0, seed=0):
+        self.catalogue = catalogue
+        self.latency = latency  # 平均响应延迟（秒）
+        self.jitter = jitter  # 延迟的随机浮动比例
+        self.error_rate = error_rate  # 返回 500 的比例
+        self.rate_limit = rate_limit  # 每秒最多处理的请求数，超出返回 429；0 表示不限
+        self.rng = random.Random(seed)
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.url = None  # 开始监听后的实际地址
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "throttled": 0, "not_found": 0}
+
+    def throttled(self):
+        """按一秒的固定窗口计数限流"""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        if now - self.window_start >= 1:
+            self.window_start = now
+            self.window_count = 0
+        self.window_count += 1
+        return self.window_count > self.rate_limit
+
+    async def respond(self, path):
+        """根据路径返回 (状态码, HTML)"""
+        self.stats["requests"] += 1
+        if self.throttled():
+            self.stats["throttled"] += 1
+            return 429, "<html><body>Too Many Requests</body></html>"
+
+        if self.latency:
+            await asyncio.sleep(max(0.0, self.latency * (1 + self.jitter * (2 * self.rng.random() - 1))))
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return 500, "<html><body>Internal Server Error</body></html>"
+
+        url = urlsplit(path)
+        body = None
+        if url.path == "/calendar/":
+            body = self.catalogue.calendar_html
+        elif url.path == "/film/":
+            film_id = parse_qs(url.query).get("vista_film_id", [""])[0]
+            body = self.catalogue.render_film(film_id)
+
+        if body is None:
+            self.stats["not_found"] += 1
+            return 404, "<html><body>Not Found</body></html>"
+        self.stats["ok"] += 1
+        return 200, body
+
+    async def handle(self, reader, writer):
+        """处理一个连接上的一个请求，响应后关闭连接"""
+        try:
+            request_line = await reader.readline()
+            # 读取并忽略请求头
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2:
+                return
+            status, body = await self.respond(parts[1])
+            payload = body.encode("utf-8")
+            headers = [
+                f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                "Content-Type: text/html; charset=utf-8",
+                f"Content-Length: {len(payload)}",
+                "Connection: close",
+            ]
+            if status == 429:
+                headers.append("Retry-After: 1")
+            writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """开始监听并返回 asyncio 服务器；port 为 0 时由系统分配端口，实际地址保存在 self.url"""
+        server = await asyncio.start_server(self.handle, host, port)
+        bound_host, bound_port = server.sockets[0].getsockname()[:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        return server
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        """启动服务器，收到 SIGINT / SIGTERM 后正常退出"""
+        server = await self.start(host, port)
+        print(f"测试服务器已启动: {self.url}/calendar/ （{len(self.catalogue.films)} 部电影，{len(self.catalogue.days)} 天）", flush=True)
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows 不支持，仍可用 Ctrl-C 退出
+                pass
+
+        async with server:
+            await stop.wait()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 爬虫模块以脚本方式平铺在 scraper/ 目录下
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
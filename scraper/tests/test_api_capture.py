@@ -0,0 +1,230 @@
+import json
+import asyncio
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+import requests
+
+from api_capture import ApiCapture, parse_sessions, session_status
+from metrograph import MetrographScraper
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+FILM_ID = "9000000001"
+
+EXPECTED = [
+    {
+        "date": "Friday April 4",
+        "showtimes": [
+            {"time": "1:00pm", "status": "Available"},
+            {"time": "7:15pm", "status": "Sold Out"},
+        ],
+    },
+    {
+        "date": "Saturday April 5",
+        "showtimes": [
+            {"time": "1:00pm", "status": "Sold Out"},
+            {"time": "7:00pm", "status": "Available"},
+            {"time": "8:30pm", "status": "Sold Out"},
+        ],
+    },
+]
+
+
+def load_fixture():
+    with open(FIXTURES / "vista_sessions.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_parse_sessions_converts_to_theater_time_and_sorts():
+    # 23:15Z 与 19:15-04:00 是同一场，其中一次售罄；00:30Z 属于纽约时间的前一天
+    assert parse_sessions(load_fixture()) == EXPECTED
+
+
+def test_parse_sessions_without_sessions():
+    assert parse_sessions({"filmId": FILM_ID, "sessions": []}) == []
+
+
+@pytest.mark.parametrize("session, status", [
+    ({"showtime": "x", "soldOut": True}, "Sold Out"),
+    ({"showtime": "x", "IsSoldOut": 1}, "Sold Out"),
+    ({"showtime": "x", "seatsAvailable": 0}, "Sold Out"),
+    ({"showtime": "x", "status": "SOLD OUT"}, "Sold Out"),
+    ({"showtime": "x", "Status": "Sold out - waitlist"}, "Sold Out"),
+    ({"showtime": "x", "soldOut": False, "seatsAvailable": 3}, "Available"),
+    ({"showtime": "x", "status": "Open"}, "Available"),
+    ({"showtime": "x"}, "Available"),
+])
+def test_session_status(session, status):
+    assert session_status(session) == status
+
+
+@pytest.fixture
+def sessions_server(tmp_path):
+    """本地服务器，/api/films/<电影 ID>/sessions.json 返回测试数据"""
+    root = tmp_path / "server"
+    path = root / "api" / "films" / FILM_ID
+    path.mkdir(parents=True)
+    (path / "sessions.json").write_text(json.dumps(load_fixture()), encoding="utf-8")
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_direct_http(sessions_server, tmp_path):
+    capture = ApiCapture(tmp_path / "api_endpoints.json")
+    # 第一个接口返回 404，应继续尝试下一个
+    capture.endpoints = [
+        f"{sessions_server}/missing/{{film_id}}.json",
+        f"{sessions_server}/api/films/{{film_id}}/sessions.json",
+    ]
+    with requests.Session() as session:
+        assert capture.fetch_direct_http(session, FILM_ID) == EXPECTED
+        assert capture.fetch_direct_http(session, "9000000002") is None
+
+
+def test_parse_sessions_skips_other_films():
+    data = {"sessions": [
+        {"filmId": FILM_ID, "showtime": "2025-04-04T19:15:00-04:00"},
+        {"filmId": "9000000002", "showtime": "2025-04-04T21:00:00-04:00"},
+    ]}
+    assert parse_sessions(data, FILM_ID) == [
+        {"date": "Friday April 4", "showtimes": [{"time": "7:15pm", "status": "Available"}]}
+    ]
+    assert len(parse_sessions(data)[0]["showtimes"]) == 2
+
+
+class StubResponse:
+    """模拟 Playwright 的 Response / APIResponse"""
+
+    def __init__(self, url, data=None, content_type="application/json", status=200):
+        self.url = url
+        self.data = data
+        self.headers = {"content-type": content_type}
+        self.status = status
+        self.ok = status < 400
+
+    async def json(self):
+        if self.data is None:
+            raise ValueError("not json")
+        return self.data
+
+
+class StubPage:
+    """只实现 page.on("response")，emit 模拟浏览器收到响应"""
+
+    def __init__(self):
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "response"
+        self.handlers.append(handler)
+
+    def emit(self, response):
+        for handler in self.handlers:
+            handler(response)
+
+
+class StubRequestContext:
+    """模拟 context.request，按 URL 返回预设的响应"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requested = []
+
+    async def get(self, url, timeout=None):
+        self.requested.append(url)
+        return self.responses.get(url) or StubResponse(url, status=404)
+
+
+def capture_responses(capture, film_id, responses):
+    async def main():
+        page = StubPage()
+        capture.attach(page, film_id)
+        for response in responses:
+            page.emit(response)
+        await capture.drain()
+
+    asyncio.run(main())
+
+
+def test_attach_records_endpoint_template(tmp_path):
+    capture = ApiCapture(tmp_path / "api_endpoints.json")
+    api = "https://tickets.example.com/api"
+    capture_responses(capture, FILM_ID, [
+        StubResponse(f"{api}/films/{FILM_ID}/sessions", load_fixture()),
+        # 非 JSON、其他电影、ID 只是更长数字的一部分、没有场次的响应都不记录
+        StubResponse(f"https://metrograph.com/film/?vista_film_id={FILM_ID}", content_type="text/html"),
+        StubResponse(f"{api}/films/9000000002/sessions", load_fixture()),
+        StubResponse(f"{api}/films/1{FILM_ID}/sessions", load_fixture()),
+        StubResponse(f"{api}/films/{FILM_ID}/poster", {"url": "poster.jpg"}),
+    ])
+
+    assert capture.endpoints == [f"{api}/films/{{film_id}}/sessions"]
+    assert capture.samples[capture.endpoints[0]] == load_fixture()
+    assert not capture.pending
+
+    capture.save()
+    assert ApiCapture(tmp_path / "api_endpoints.json").endpoints == capture.endpoints
+
+
+def test_attach_ignores_cinema_wide_sessions_of_other_films(tmp_path):
+    capture = ApiCapture(tmp_path / "api_endpoints.json")
+    # 整个影院的场次接口，URL 中碰巧带有这部电影的 ID，但场次都属于其他电影
+    payload = {"sessions": [
+        {"filmId": "9000000002", "showtime": "2025-04-04T19:15:00-04:00"},
+        {"filmId": "9000000003", "showtime": "2025-04-04T21:00:00-04:00"},
+    ]}
+    capture_responses(capture, FILM_ID, [
+        StubResponse(f"https://tickets.example.com/api/sessions?highlight={FILM_ID}", payload),
+    ])
+    assert capture.endpoints == []
+
+
+def test_fetch_direct_tries_each_endpoint(tmp_path):
+    capture = ApiCapture(tmp_path / "api_endpoints.json")
+    capture.endpoints = ["https://a.example.com/{film_id}", "https://b.example.com/{film_id}"]
+    request = StubRequestContext({
+        f"https://b.example.com/{FILM_ID}": StubResponse(f"https://b.example.com/{FILM_ID}", load_fixture()),
+    })
+
+    assert asyncio.run(capture.fetch_direct(request, FILM_ID)) == EXPECTED
+    assert request.requested == [f"https://a.example.com/{FILM_ID}", f"https://b.example.com/{FILM_ID}"]
+    assert asyncio.run(capture.fetch_direct(request, "9000000002")) is None
+
+
+def test_scrape_single_movie_from_api_reuses_previous_details(tmp_path):
+    scraper = MetrographScraper(use_api=True)
+    scraper.api_capture = ApiCapture(tmp_path / "api_endpoints.json")
+    scraper.api_capture.endpoints = ["https://tickets.example.com/api/films/{film_id}/sessions"]
+    url = f"https://tickets.example.com/api/films/{FILM_ID}/sessions"
+    scraper.context = type("StubContext", (), {"request": StubRequestContext({url: StubResponse(url, load_fixture())})})()
+    scraper.previous_films = {FILM_ID: {
+        "id": FILM_ID, "director": "Edward Yang", "year": "1991", "runtime": "237min",
+        "synopsis": "", "all_screenings": [],
+    }}
+    movie = {"title": "A Brighter Summer Day", "vista_film_id": FILM_ID,
+             "detail_url": f"https://metrograph.com/film/?vista_film_id={FILM_ID}"}
+
+    details = asyncio.run(scraper.scrape_single_movie_from_api(movie))
+    assert details == {
+        "director": "Edward Yang", "year": "1991", "runtime": "237min",
+        "detail_url": movie["detail_url"], "all_screenings": EXPECTED,
+        "vista_film_id": FILM_ID, "title": movie["title"],
+    }
+
+    # 没有上一次的数据时无法补全其他详情，交给浏览器渲染
+    scraper.previous_films = {}
+    assert asyncio.run(scraper.scrape_single_movie_from_api(movie)) is None
@@ -0,0 +1,77 @@
+import csv
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cli import main
+
+SCRAPER_DIR = Path(__file__).resolve().parent.parent
+
+FILMS = [
+    {
+        "id": "9000000001", "title": "Late Spring", "director": "Yasujirō Ozu", "year": "1949",
+        "runtime": "108min", "detail_url": "https://metrograph.com/film/?vista_film_id=9000000001",
+        "screenings": [
+            {"date": "Friday April 4", "showtimes": [
+                {"time": "4:00pm", "status": "Available"}, {"time": "7:00pm", "status": "Sold Out"},
+            ]},
+            {"date": "Saturday April 5", "showtimes": [{"time": "2:00pm", "status": "Available"}]},
+        ],
+    },
+    {
+        "id": "9000000002", "title": "Playtime, 70mm", "director": "Jacques Tati", "year": "1967",
+        "runtime": "124min", "detail_url": "https://metrograph.com/film/?vista_film_id=9000000002",
+        "screenings": [{"date": "Friday April 4", "showtimes": [{"time": "9:30pm", "status": "Available"}]}],
+    },
+]
+
+
+@pytest.fixture
+def films_json(tmp_path):
+    path = tmp_path / "films.json"
+    path.write_text(json.dumps(FILMS, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("command", [
+    ["export", "--format", "csv", "--output", "{tmp}/films.csv"],
+    ["export", "--compact"],
+    ["publish", "--target", "{tmp}/public/films.json"],
+])
+def test_light_commands_skip_heavy_imports(films_json, tmp_path, command):
+    argv =[arg.format(tmp=tmp_path) for arg in command] + ["--input", str(films_json)]
+    script = (
+        "import sys, cli\n"
+        f"code = cli.main({argv!r})\n"
+        "heavy = sorted(m for m in ('playwright', 'bs4', 'requests') if m in sys.modules)\n"
+        "print(code, heavy, file=sys.stderr)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=SCRAPER_DIR, capture_output=True, text=True, check=True
+    )
+    assert result.stderr.strip().splitlines()[-1] == "0 []"
+
+
+def test_export_csv_round_trip(films_json, tmp_path):
+    output = tmp_path / "films.csv"
+    assert main(["export", "--input", str(films_json), "--format", "csv", "--output", str(output)]) == 0
+
+    with open(output, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == ["id", "title", "director", "year", "runtime", "date", "time", "status", "detail_url"]
+    assert [(row["id"], row["date"], row["time"], row["status"]) for row in rows] == [
+        (film["id"], day["date"], showtime["time"], showtime["status"])
+        for film in FILMS for day in film["screenings"] for showtime in day["showtimes"]
+    ]
+    # 带逗号和非 ASCII 字符的字段原样保留
+    assert rows[-1]["title"] == "Playtime, 70mm"
+    assert rows[0]["director"] == "Yasujirō Ozu"
+
+
+def test_export_json_round_trip(films_json, tmp_path):
+    output = tmp_path / "export.json"
+    assert main(["export", "--input", str(films_json), "--output", str(output)]) == 0
+    assert json.loads(output.read_text(encoding="utf-8")) == FILMS
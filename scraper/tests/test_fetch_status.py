@@ -0,0 +1,108 @@
+import gzip
+import json
+import time
+import asyncio
+
+import pytest
+
+import metrograph
+from fetchers import FetchError
+from metrograph import MetrographScraper
+from standin_server import StandinCatalogue
+
+BASE_URL = "http://127.0.0.1:8765"
+
+
+def write_archive(path, statuses=None):
+    """用测试服务器的页面生成回放存档，statuses 为 {电影序号: 状态码}"""
+    catalogue = StandinCatalogue(films=3, seed=1)
+    film_ids = list(catalogue.films)
+    pages = {f"{BASE_URL}/calendar/": {"status": 200, "body": catalogue.calendar_html}}
+    for i, film_id in enumerate(film_ids):
+        status = (statuses or {}).get(i, 200)
+        body = catalogue.render_film(film_id) if status == 200 else "<html><body>error</body></html>"
+        pages[f"{BASE_URL}/film/?vista_film_id={film_id}"] = {"status": status, "body": body}
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump({"version": 1, "pages": pages}, f)
+    return film_ids
+
+
+def scrape(archive):
+    scraper = MetrographScraper(replay_path=str(archive), base_url=BASE_URL)
+
+    async def main():
+        await scraper.initialize_fetcher()
+        await scraper.scrape_calendar()
+        await scraper.scrape_movie_details()
+
+    asyncio.run(main())
+    return scraper
+
+
+def test_error_status_fails_the_page(tmp_path, capsys):
+    archive = tmp_path / "archive.json.gz"
+    film_ids = write_archive(archive, {0: 500})
+
+    scrape(archive)
+    out = capsys.readouterr().out
+    assert f"HTTP 500: {BASE_URL}/film/?vista_film_id={film_ids[0]}" in out
+    assert "成功抓取了 2 部电影的详情" in out
+
+
+def test_throttled_page_is_retried_then_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrograph, "DEFAULT_RETRY_AFTER", 0)
+    archive = tmp_path / "archive.json.gz"
+    film_ids = write_archive(archive, {1: 429})
+    url = f"{BASE_URL}/film/?vista_film_id={film_ids[1]}"
+
+    scraper = MetrographScraper(replay_path=str(archive), base_url=BASE_URL)
+    requested = []
+
+    async def main():
+        await scraper.initialize_fetcher()
+        fetch = scraper.fetcher.fetch
+
+        async def counting_fetch(page_url, wait_selector, **kwargs):
+            requested.append(page_url)
+            return await fetch(page_url, wait_selector, **kwargs)
+
+        scraper.fetcher.fetch = counting_fetch
+        with pytest.raises(FetchError) as error:
+            await scraper.fetch_page(url, scraper.venue.detail_selector)
+        return error.value
+
+    error = asyncio.run(main())
+    assert error.status == 429
+    assert requested == [url] * (metrograph.MAX_THROTTLE_RETRIES + 1)
+
+
+def test_calendar_error_fails_fast(tmp_path):
+    archive = tmp_path / "archive.json.gz"
+    write_archive(archive)
+    with gzip.open(archive, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    data["pages"][f"{BASE_URL}/calendar/"]["status"] = 503
+    with gzip.open(archive, 'wt', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    with pytest.raises(FetchError, match="HTTP 503"):
+        scrape(archive)
+
+
+def test_retry_after_is_capped(monkeypatch):
+    monkeypatch.setattr(metrograph, "MAX_RETRY_AFTER", 0.01)
+    url = f"{BASE_URL}/calendar/"
+    responses = [
+        {"url": url, "status": 429, "body": "", "retry_after": 3600.0},
+        {"url": url, "status": 200, "body": "<html>ok</html>"},
+    ]
+
+    class ThrottledOnce:
+        async def fetch(self, page_url, wait_selector, **kwargs):
+            return responses.pop(0)
+
+    scraper = MetrographScraper(base_url=BASE_URL)
+    scraper.fetcher = ThrottledOnce()
+    start_time = time.perf_counter()
+    assert asyncio.run(scraper.fetch_page(url, "body"))["body"] == "<html>ok</html>"
+    assert time.perf_counter() - start_time < 1
@@ -0,0 +1,116 @@
+import gzip
+import json
+import asyncio
+
+import pytest
+
+from fetchers import ARCHIVE_VERSION, RecordingArchive, RecordingFetcher, ReplayFetcher
+from metrograph import MetrographScraper
+from standin_server import StandinCatalogue
+
+BASE_URL = "http://127.0.0.1:8765"
+
+
+class StubFetcher:
+    """按 URL 返回预设页面的 fetcher，记录调用参数"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+        self.closed = False
+
+    async def fetch(self, url, wait_selector, **kwargs):
+        self.calls.append((url, wait_selector, kwargs))
+        status, body = self.pages[url]
+        return {"url": url, "status": status, "body": body}
+
+    def close(self):
+        self.closed = True
+
+
+def record(archive, pages, base_urls=None):
+    inner = StubFetcher(pages)
+    recorder = RecordingFetcher(inner, archive)
+    recorder.base_urls.update(base_urls or {})
+
+    async def main():
+        for url in pages:
+            await recorder.fetch(url, ".movie-info", scroll=True)
+
+    asyncio.run(main())
+    recorder.close()
+    return inner
+
+
+def test_record_then_replay(tmp_path):
+    archive = tmp_path / "archive.json.gz"
+    pages = {
+        f"{BASE_URL}/calendar/": (200, "<html>calendar</html>"),
+        f"{BASE_URL}/film/?vista_film_id=1": (404, "<html>missing</html>"),
+    }
+    inner = record(archive, pages, {"metrograph": BASE_URL})
+    # 录制时参数原样传给内部 fetcher，关闭时一并关闭
+    assert inner.calls[0] == (f"{BASE_URL}/calendar/", ".movie-info", {"scroll": True})
+    assert inner.closed
+
+    replay = ReplayFetcher(archive)
+    assert replay.base_urls == {"metrograph": BASE_URL}
+    for url, (status, body) in pages.items():
+        assert asyncio.run(replay.fetch(url, ".movie-info")) == {"url": url, "status": status, "body": body}
+    with pytest.raises(LookupError):
+        asyncio.run(replay.fetch(f"{BASE_URL}/film/?vista_film_id=2", ".movie-info"))
+
+
+def test_replay_rejects_other_versions(tmp_path):
+    archive = tmp_path / "archive.json.gz"
+    with gzip.open(archive, 'wt', encoding='utf-8') as f:
+        json.dump({"version": ARCHIVE_VERSION + 1, "pages": {}}, f)
+    with pytest.raises(ValueError):
+        ReplayFetcher(archive)
+
+
+def test_replay_defaults_to_recorded_base_url(tmp_path):
+    archive = tmp_path / "archive.json.gz"
+    catalogue = StandinCatalogue(films=2, seed=1)
+    pages = {f"{BASE_URL}/calendar/": (200, catalogue.calendar_html)}
+    for film_id in catalogue.films:
+        pages[f"{BASE_URL}/film/?vista_film_id={film_id}"] = (200, catalogue.render_film(film_id))
+    record(archive, pages, {"metrograph": BASE_URL})
+
+    scraper = MetrographScraper(replay_path=str(archive))
+
+    async def main():
+        await scraper.initialize_fetcher()
+        await scraper.scrape_calendar()
+        await scraper.scrape_movie_details()
+
+    asyncio.run(main())
+    assert scraper.calendar_url == f"{BASE_URL}/calendar/"
+    films = scraper.merge_data()
+    assert sorted(film["id"] for film in films) == sorted(catalogue.films)
+    assert all(film["detail_url"].startswith(BASE_URL) and film.get("director") for film in films)
+
+    # 明确指定的网址优先于存档中记录的网址
+    scraper = MetrographScraper(replay_path=str(archive), base_url="http://127.0.0.1:9999")
+    asyncio.run(scraper.initialize_fetcher())
+    assert scraper.calendar_url == "http://127.0.0.1:9999/calendar/"
+
+
+def test_shared_archive_is_saved_once_by_its_owner(tmp_path):
+    archive_path = tmp_path / "venues.json.gz"
+    archive = RecordingArchive(archive_path)
+    recorders = [
+        RecordingFetcher(StubFetcher({f"{BASE_URL}/calendar/": (200, "metrograph")}), archive=archive),
+        RecordingFetcher(StubFetcher({"file:///fixture/calendar.html": (200, "fixture")}), archive=archive),
+    ]
+    recorders[0].base_urls["metrograph"] = BASE_URL
+    for recorder in recorders:
+        asyncio.run(recorder.fetch(next(iter(recorder.inner.pages)), "body"))
+        recorder.close()
+    # 各场馆关闭时不写入，避免后关闭的覆盖先关闭的
+    assert not archive_path.exists()
+
+    archive.save()
+    replay = ReplayFetcher(archive_path)
+    assert set(replay.pages) == {f"{BASE_URL}/calendar/", "file:///fixture/calendar.html"}
+    assert replay.base_urls == {"metrograph": BASE_URL}
@@ -0,0 +1,77 @@
+import time
+import asyncio
+
+from profiler import PhaseProfiler
+
+
+async def blocking_call():
+    # 协程中误用同步 sleep，阻塞事件循环
+    time.sleep(0.2)
+
+
+def run_phases(profiler):
+    async def main():
+        profiler.start()
+        await asyncio.sleep(0.05)
+        with profiler.phase("details"):
+            await blocking_call()
+            await asyncio.sleep(0.05)
+        with profiler.phase("idle"):
+            await asyncio.sleep(0.2)
+        # 同步阶段不会让出事件循环，阻塞在 stop 时补记
+        with profiler.phase("save"):
+            time.sleep(0.2)
+        profiler.stop()
+
+    asyncio.run(main())
+
+
+def blocked(profiler, name):
+    return [lag for lag in profiler.phase_lags(name) if lag > profiler.lag_threshold]
+
+
+def test_blocking_calls_are_attributed_to_their_phase(tmp_path):
+    profiler = PhaseProfiler(tmp_path)
+    run_phases(profiler)
+
+    details = blocked(profiler, "details")
+    assert len(details) == 1 and details[0] >= 0.15
+    assert blocked(profiler, "idle") == []
+    save = blocked(profiler, "save")
+    assert len(save) == 1 and save[0] >= 0.15
+
+    summary = (tmp_path / "summary.txt").read_text(encoding="utf-8").splitlines()
+    rows = {line.split()[0]: line.split() for line in summary[2:]}
+    assert rows["details"][-1] == "1"
+    assert rows["idle"][-1] == "0"
+    assert rows["save"][-1] == "1"
+
+
+def run_mode(tmp_path, mode):
+    profiler = PhaseProfiler(tmp_path, mode=mode)
+
+    async def main():
+        profiler.start()
+        with profiler.phase("merge"):
+            data = [str(i) * 10 for i in range(20000)]
+        profiler.stop()
+        return data
+
+    asyncio.run(main())
+    return (tmp_path / "summary.txt").read_text(encoding="utf-8").splitlines()
+
+
+def test_cpu_mode_profiles_without_tracing_allocations(tmp_path):
+    summary = run_mode(tmp_path, "cpu")
+    assert summary[0].startswith("# mode: cpu")
+    assert (tmp_path / "merge.prof").exists()
+    assert not (tmp_path / "allocations.txt").exists()
+    assert summary[2].split()[2:4] == ["-", "-"]
+
+
+def test_memory_mode_traces_allocations_without_cprofile(tmp_path):
+    summary = run_mode(tmp_path, "memory")
+    assert summary[0].startswith("# mode: memory")
+    assert not (tmp_path / "merge.prof").exists()
+    assert "=== merge ===" in (tmp_path / "allocations.txt").read_text(encoding="utf-8")
+    assert float(summary[2].split()[3]) > 100
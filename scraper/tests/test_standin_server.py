@@ -0,0 +1,69 @@
+import time
+import asyncio
+
+import requests
+
+from standin_server import StandinCatalogue, StandinServer
+
+
+def run_against(server, paths, requests_at_once=False):
+    """在系统分配的端口上启动服务器，依次（或同时）请求 paths，返回 requests 的响应列表"""
+    async def main():
+        listener = await server.start("127.0.0.1", 0)
+        async with listener:
+            def get(path):
+                return requests.get(f"{server.url}{path}", timeout=10)
+
+            if requests_at_once:
+                return await asyncio.gather(*(asyncio.to_thread(get, path) for path in paths))
+            return [await asyncio.to_thread(get, path) for path in paths]
+
+    return asyncio.run(main())
+
+
+def catalogue():
+    return StandinCatalogue(films=3, seed=1)
+
+
+def test_pages_and_unknown_film():
+    server = StandinServer(catalogue())
+    film_id = next(iter(server.catalogue.films))
+    calendar, film, missing, other = run_against(server, [
+        "/calendar/", f"/film/?vista_film_id={film_id}", "/film/?vista_film_id=1", "/nothing/",
+    ])
+    assert server.url.startswith("http://127.0.0.1:") and not server.url.endswith(":0")
+    assert calendar.status_code == 200 and "calendar-list-day" in calendar.text
+    assert film.status_code == 200 and "movie-info" in film.text
+    assert (missing.status_code, other.status_code) == (404, 404)
+    assert server.stats == {"requests": 4, "ok": 2, "errors": 0, "throttled": 0, "not_found": 2}
+
+
+def test_rate_limit_returns_429_with_retry_after():
+    server = StandinServer(catalogue(), rate_limit=2)
+    responses = run_against(server, ["/calendar/"] * 5)
+    statuses = [response.status_code for response in responses]
+    assert statuses[:2] == [200, 200]
+    assert statuses.count(429) >= 1
+    assert all(response.headers["Retry-After"] == "1" for response in responses if response.status_code == 429)
+    assert server.stats["throttled"] == statuses.count(429)
+
+
+def test_error_rate_returns_500():
+    server = StandinServer(catalogue(), error_rate=1.0)
+    responses = run_against(server, ["/calendar/"] * 3)
+    assert [response.status_code for response in responses] == [500, 500, 500]
+    assert server.stats["errors"] == 3
+
+    server = StandinServer(catalogue(), error_rate=0.5, seed=3)
+    statuses = {response.status_code for response in run_against(server, ["/calendar/"] * 20)}
+    assert statuses == {200, 500}
+
+
+def test_latency_is_applied_concurrently():
+    server = StandinServer(catalogue(), latency=0.2, jitter=0)
+    start_time = time.perf_counter()
+    responses = run_against(server, ["/calendar/"] * 4, requests_at_once=True)
+    elapsed = time.perf_counter() - start_time
+    assert all(response.status_code == 200 for response in responses)
+    # 每个请求至少延迟 0.2 秒，同时处理时总耗时不会累加
+    assert 0.2 <= elapsed < 0.6
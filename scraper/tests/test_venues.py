@@ -0,0 +1,93 @@
+import gzip
+import json
+import asyncio
+from urllib.parse import urljoin
+
+import pytest
+
+from engine import VenueEngine
+from standin_server import StandinCatalogue
+from venues import VENUES, Venue, get_venue
+from venues.fixture import FIXTURE_DIR, FixtureVenue
+
+BASE_URL = "http://127.0.0.1:8765"
+
+
+def fixture_pages():
+    """测试影院的本地页面，键为 FixtureVenue 使用的 file:// 网址"""
+    venue = FixtureVenue()
+    pages = {venue.calendar_url: (FIXTURE_DIR / "calendar.html").read_text(encoding="utf-8")}
+    for path in (FIXTURE_DIR / "films").glob("*.html"):
+        pages[urljoin(venue.base_url + '/', f"films/{path.name}")] = path.read_text(encoding="utf-8")
+    return pages
+
+
+def screening_set(screenings):
+    return {(day["date"], showtime["time"], showtime["status"]) for day in screenings for showtime in day["showtimes"]}
+
+
+def test_fixture_venue_parsers():
+    venue = FixtureVenue()
+    pages = fixture_pages()
+    movies = venue.parse_calendar(pages[venue.calendar_url])
+    assert [(movie["vista_film_id"], movie["date"]) for movie in movies] == [
+        ("FC-101", "Friday April 4"), ("FC-102", "Friday April 4"), ("FC-101", "Saturday April 5"),
+    ]
+    assert movies[0]["showtimes"] == [
+        {"time": "4:00pm", "status": "Available"}, {"time": "7:00pm", "status": "Sold Out"},
+    ]
+
+    details = venue.parse_details(pages[movies[0]["detail_url"]], movies[0])
+    assert details["director"] == "Yasujirō Ozu"
+    assert (details["year"], details["runtime"]) == ("1949", "108min")
+    assert details["poster_url"].endswith("late-spring.jpg")
+    assert screening_set(details["all_screenings"]) == {
+        ("Friday April 4", "4:00pm", "Available"),
+        ("Friday April 4", "7:00pm", "Sold Out"),
+        ("Saturday April 5", "2:00pm", "Available"),
+    }
+
+
+def test_venue_requires_parsers():
+    class Incomplete(Venue):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert [name for name, venue in VENUES.items() if not venue.testing] == ["metrograph"]
+
+
+def test_engine_replays_all_venues_from_one_archive(tmp_path):
+    catalogue = StandinCatalogue(films=4, seed=2)
+    pages = {url: {"status": 200, "body": body} for url, body in fixture_pages().items()}
+    pages[f"{BASE_URL}/calendar/"] = {"status": 200, "body": catalogue.calendar_html}
+    for film_id in catalogue.films:
+        pages[f"{BASE_URL}/film/?vista_film_id={film_id}"] = {"status": 200, "body": catalogue.render_film(film_id)}
+    archive = tmp_path / "venues.json.gz"
+    with gzip.open(archive, 'wt', encoding='utf-8') as f:
+        json.dump({"version": 1, "base_urls": {"metrograph": BASE_URL}, "pages": pages}, f)
+
+    output = tmp_path / "venues_movies.json"
+    engine = VenueEngine([get_venue("metrograph"), get_venue("fixture")], replay_path=str(archive))
+    assert asyncio.run(engine.run(str(output)))
+
+    with open(output, encoding='utf-8') as f:
+        films = {(film["venue"], film["id"]): film for film in json.load(f)}
+    assert set(films) == {("metrograph", film_id) for film_id in catalogue.films} | {
+        ("fixture", "FC-101"), ("fixture", "FC-102"),
+    }
+
+    # 同一部电影在多天放映，整合为一条记录
+    late_spring = films[("fixture", "FC-101")]
+    assert late_spring["title"] == "Late Spring"
+    assert {day["date"] for day in late_spring["screenings"]} == {"Friday April 4", "Saturday April 5"}
+
+    for film_id, film in catalogue.films.items():
+        expected = {
+            (day, time_text, "Sold Out" if sold_out else "Available")
+            for day, showtimes in film["screenings"].items()
+            for time_text, sold_out in showtimes
+        }
+        merged = films[("metrograph", film_id)]
+        assert screening_set(merged["screenings"]) == expected
+        assert merged["director"] == film["director"]
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from work_queue import WorkQueue
+
+LEASE = 0.1
+
+MOVIE = {"vista_film_id": "9000000001", "title": "Synthetic Film 1"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(str(tmp_path / "work_queue.sqlite3"), lease_seconds=LEASE, max_attempts=2)
+    queue.reset({MOVIE["vista_film_id"]: MOVIE})
+    yield queue
+    queue.close()
+
+
+def expire():
+    time.sleep(LEASE * 1.5)
+
+
+def test_expired_lease_is_reclaimed_and_stale_complete_ignored(queue):
+    assert queue.claim("worker-a") == [MOVIE]
+    assert queue.claim("worker-b") == []
+
+    expire()
+    assert queue.claim("worker-b") == [MOVIE]
+
+    # worker-a 的租约已被 worker-b 接管，它提交的结果被忽略
+    queue.complete("worker-a", MOVIE["vista_film_id"], {"title": "stale"})
+    assert queue.counts()["claimed"] == 1
+    assert queue.results() == []
+
+    queue.complete("worker-b", MOVIE["vista_film_id"], {"title": "fresh"})
+    assert queue.results() == [{"title": "fresh"}]
+    assert queue.unfinished() == 0
+
+
+def test_renewed_lease_is_not_reclaimed(queue):
+    assert queue.claim("worker-a") == [MOVIE]
+    time.sleep(LEASE * 0.6)
+    queue.renew("worker-a", [MOVIE["vista_film_id"]])
+    time.sleep(LEASE * 0.6)
+    assert queue.claim("worker-b") == []
+
+
+def test_job_fails_after_max_attempts_expire(queue):
+    assert queue.claim("worker-a") == [MOVIE]
+    expire()
+    assert queue.claim("worker-b") == [MOVIE]
+    expire()
+
+    # 两次尝试的租约都已过期，不再被领取
+    assert queue.claim("worker-c") == []
+    assert queue.counts()["failed"] == 1
+    assert queue.unfinished() == 0
+
+
+def test_empty_result_requeues_until_max_attempts(queue):
+    film_id = MOVIE["vista_film_id"]
+    assert queue.claim("worker-a") == [MOVIE]
+    queue.complete("worker-a", film_id, None)
+    assert queue.counts()["pending"] == 1
+
+    assert queue.claim("worker-b") == [MOVIE]
+    queue.complete("worker-b", film_id, None)
+    assert queue.counts()["failed"] == 1
+    assert queue.claim("worker-c") == []
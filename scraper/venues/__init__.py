@@ -0,0 +1,19 @@
+"""
+场馆适配器 - 按名称查找
+"""
+
+from venues.base import Venue
+from venues.metrograph import MetrographVenue
+from venues.fixture import FixtureVenue
+
+VENUES = {
+    MetrographVenue.name: MetrographVenue,
+    FixtureVenue.name: FixtureVenue,
+}
+
+
+def get_venue(name, base_url=None):
+    """根据名称创建场馆适配器"""
+    if name not in VENUES:
+        raise ValueError(f"未知场馆: {name}（可选: {', '.join(VENUES)}）")
+    return VENUES[name](base_url=base_url)
@@ -0,0 +1,44 @@
+"""
+场馆适配器接口 - 每个影院提供网址、等待的关键元素、页面解析规则和电影 ID 提取
+抓取流程（浏览器、并发、合并、保存）与具体影院无关，由 MetrographScraper 和 VenueEngine 负责
+"""
+
+from abc import ABC, abstractmethod
+from urllib.parse import urljoin
+
+
+class Venue(ABC):
+    """
+    场馆适配器基类
+
+    parse_calendar 返回的每个条目需包含 title、detail_url、date、showtimes 和 vista_film_id，
+    vista_film_id 是整个流程通用的电影 ID 字段（沿用 Metrograph 的命名），其他场馆填入各自的 ID
+    """
+
+    name = None  # 场馆标识，写入统一输出的 venue 字段
+    base_url = None
+    calendar_path = None  # 日历页相对 base_url 的路径
+    calendar_selector = None  # 日历页加载完成的标志元素
+    detail_selector = None  # 详情页加载完成的标志元素
+    testing = False  # 仅用于测试的场馆，不参与默认的抓取
+
+    def __init__(self, base_url=None):
+        # 可覆盖网址，例如指向本地的测试服务器
+        if base_url:
+            self.base_url = base_url.rstrip('/')
+
+    @property
+    def calendar_url(self):
+        return urljoin(self.base_url + '/', self.calendar_path.lstrip('/'))
+
+    @abstractmethod
+    def extract_film_id(self, url):
+        """从详情页 URL 中提取电影 ID，无法识别时返回 None"""
+
+    @abstractmethod
+    def parse_calendar(self, content):
+        """解析日历页面 HTML，返回电影放映条目列表"""
+
+    @abstractmethod
+    def parse_details(self, content, movie):
+        """解析详情页 HTML，返回 poster_url、director、year、runtime、synopsis、all_screenings 等字段"""
@@ -0,0 +1,101 @@
+"""
+测试用场馆适配器 - 页面结构与 Metrograph 不同，默认读取 venues/fixtures/fixture_cinema 下的本地 HTML
+用于验证场馆接口和多场馆引擎，也可通过 base_url 指向提供相同页面的服务器
+"""
+
+import re
+from pathlib import Path
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+
+from venues.base import Venue
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "fixture_cinema"
+
+
+class FixtureVenue(Venue):
+    """本地测试影院"""
+
+    name = "fixture"
+    base_url = FIXTURE_DIR.as_uri()
+    calendar_path = "calendar.html"
+    calendar_selector = ".schedule-day"
+    detail_selector = ".film-detail"
+    testing = True
+
+    def extract_film_id(self, url):
+        """从 films/<id>.html 中提取电影 ID"""
+        match = re.search(r'films/([\w-]+)\.html', url)
+        if match:
+            return match.group(1)
+        return None
+
+    def parse_sessions(self, container):
+        """解析一组放映时间，带 full 类的场次视为售罄"""
+        return [
+            {
+                "time": session.text.strip(),
+                "status": "Sold Out" if 'full' in session.get('class', []) else "Available"
+            }
+            for session in container.select('.session')
+            if session.text.strip()
+        ]
+
+    def parse_calendar(self, content):
+        """解析日程页面，返回每个放映日每部电影的基本信息和链接"""
+        movies = []
+        soup = BeautifulSoup(content, 'html.parser')
+
+        for day in soup.select('.schedule-day'):
+            date_text = day.get('data-date', '').strip()
+            if not date_text:
+                continue
+
+            for screening in day.select('.screening'):
+                link = screening.select_one('a.film-link')
+                if not link or not link.get('href'):
+                    continue
+
+                detail_url = urljoin(self.base_url + '/', link['href'])
+                movies.append({
+                    "title": link.text.strip(),
+                    "detail_url": detail_url,
+                    "date": date_text,
+                    "showtimes": self.parse_sessions(screening),
+                    "vista_film_id": self.extract_film_id(detail_url)
+                })
+
+        return movies
+
+    def parse_details(self, content, movie):
+        """解析电影详情页"""
+        details = {}
+        soup = BeautifulSoup(content, 'html.parser')
+
+        poster_elem = soup.select_one('.film-detail img.poster')
+        if poster_elem and poster_elem.get('src'):
+            details["poster_url"] = poster_elem['src']
+
+        # 演职员表为 dt/dd 成对出现
+        fields = {"Director": "director", "Year": "year", "Runtime": "runtime"}
+        for dt in soup.select('.credits dt'):
+            dd = dt.find_next_sibling('dd')
+            key = fields.get(dt.text.strip())
+            if key and dd and dd.text.strip():
+                details[key] = dd.text.strip()
+
+        synopsis_elem = soup.select_one('.synopsis')
+        if synopsis_elem and synopsis_elem.text.strip():
+            details["synopsis"] = synopsis_elem.text.strip()
+
+        details["detail_url"] = movie["detail_url"]
+
+        screening_days = []
+        for day in soup.select('.sessions li'):
+            showtimes = self.parse_sessions(day)
+            if day.get('data-date') and showtimes:
+                screening_days.append({"date": day['data-date'].strip(), "showtimes": showtimes})
+        if screening_days:
+            details["all_screenings"] = screening_days
+
+        return details
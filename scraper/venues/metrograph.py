@@ -0,0 +1,287 @@
+"""
+Metrograph 场馆适配器 - 日历页和详情页的解析规则
+"""
+
+import re
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+
+from venues.base import Venue
+
+
+class MetrographVenue(Venue):
+    """metrograph.com"""
+
+    name = "metrograph"
+    base_url = "https://metrograph.com"
+    calendar_path = "/calendar/"
+    calendar_selector = ".calendar-list-day"
+    detail_selector = ".movie-info"
+
+    def extract_film_id(self, url):
+        """从 URL 中提取电影 ID"""
+        match = re.search(r'vista_film_id=(\d+)', url)
+        if match:
+            return match.group(1)
+        return None
+
+    def parse_calendar(self, content):
+        """解析日历页面，返回每个放映日每部电影的基本信息和链接"""
+        movies = []
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # 查找所有日历日期区块
+        calendar_days = soup.find_all('div', class_='calendar-list-day')
+
+        for day in calendar_days:
+            # 获取日期
+            date_elem = day.find('div', class_='date')
+            if not date_elem:
+                continue
+
+            date_text = date_elem.text.strip()
+
+            # 查找当天的所有电影条目
+            movie_items = day.find_all('div', class_='item')
+
+            for item in movie_items:
+                # 提取电影标题和链接
+                title_elem = item.find('a', class_='title')
+                if not title_elem:
+                    continue
+
+                title = title_elem.text.strip()
+                detail_url = title_elem.get('href')
+
+                if not detail_url:
+                    continue
+
+                # 确保 URL 是绝对路径
+                if not detail_url.startswith('http'):
+                    detail_url = urljoin(self.base_url, detail_url)
+
+                # 提取放映时间
+                showtimes = []
+                for time_link in item.find_all('a'):
+                    if 'title' not in time_link.attrs or time_link.attrs.get('class') == ['title']:
+                        continue
+
+                    time_text = time_link.text.strip()
+                    ticket_status = "Available"
+
+                    if time_link.get('class') and 'sold_out' in time_link.get('class'):
+                        ticket_status = "Sold Out"
+
+                    showtimes.append({
+                        "time": time_text,
+                        "status": ticket_status
+                    })
+
+                # 创建电影基本信息
+                movie_info = {
+                    "title": title,
+                    "detail_url": detail_url,
+                    "date": date_text,
+                    "showtimes": showtimes,
+                    "vista_film_id": self.extract_film_id(detail_url)
+                }
+
+                movies.append(movie_info)
+
+        return movies
+
+    def parse_details(self, content, movie):
+        """解析电影详情页，返回海报、导演、年份、时长、简介和所有放映场次"""
+        details = {}
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # 提取电影详情
+        # 获取海报图片 URL
+        poster_elem = soup.select_one('.movie-image img')
+        if poster_elem and 'src' in poster_elem.attrs:
+            details["poster_url"] = poster_elem['src']
+
+        # 获取导演
+        director_elem = soup.select_one('.movie-info h5:-soup-contains("Director:")')
+        if director_elem:
+            director_text = director_elem.text.strip()
+            if "Director:" in director_text:
+                details["director"] = director_text.replace("Director:", "").strip()
+
+        # 获取年份、时长等信息
+        info_elem = soup.select_one('.movie-info h5:nth-of-type(2)')
+        if info_elem:
+            info_text = info_elem.text.strip()
+            # 尝试分离年份和时长
+            info_parts = info_text.split('/')
+            if len(info_parts) >= 2:
+                details["year"] = info_parts[0].strip()
+                runtime_part = info_parts[1].strip()
+                if "min" in runtime_part:
+                    details["runtime"] = runtime_part
+
+        # 获取简介 - 完全重写以更好地处理HTML结构
+        synopsis = ""
+
+        # 方法1: 尝试从 .movie-info > p > p 结构获取简介
+        synopsis_container = soup.select_one('.movie-info > p')
+        if synopsis_container:
+            # 首先尝试找到嵌套的p标签
+            nested_ps = synopsis_container.find_all('p', recursive=True)
+
+            if nested_ps and len(nested_ps) > 0:
+                # 使用第一个非空p标签的内容作为简介
+                for p in nested_ps:
+                    if p.text.strip() and not p.find('a', class_='back-link'):
+                        synopsis = p.text.strip()
+                        break
+
+            # 如果通过嵌套p标签没找到，尝试直接使用内容
+            if not synopsis and synopsis_container.text.strip():
+                text = synopsis_container.text.strip()
+                if "Back to films" in text:
+                    text = text.replace("Back to films", "").strip()
+                synopsis = text
+
+        # 方法2: 尝试从 .fl-module-content p 获取简介
+        if not synopsis:
+            module_content = soup.select_one('.fl-module-content')
+            if module_content:
+                paragraphs = module_content.select('p')
+                for p in paragraphs:
+                    if p.text.strip() and 'back-link' not in str(p):
+                        synopsis = p.text.strip()
+                        break
+
+        # 方法3: 尝试广泛搜索任何可能包含简介的元素
+        if not synopsis:
+            all_paras = soup.select('p')
+            for p in all_paras:
+                # 排除菜单、链接等明显不是简介的元素
+                if len(p.text.strip()) > 100 and not p.find('a', class_='back-link'):
+                    synopsis = p.text.strip()
+                    break
+
+        if synopsis:
+            details["synopsis"] = synopsis
+
+        # 保存详情页链接
+        details["detail_url"] = movie["detail_url"]
+
+        # 获取所有放映日期
+        screening_days = []
+
+        # 尝试从日期选择器中获取日期
+        day_selector = soup.select('.film_day_chooser li a')
+        if day_selector:
+            # 有日期选择器的情况
+            for day_elem in day_selector:
+                if 'data-day' in day_elem.attrs:
+                    day_text = day_elem.text.strip()
+                    day_id = day_elem['data-day']
+
+                    # 查找对应日期的放映时间
+                    day_div = soup.select_one(f'#day_{day_id}')
+                    if day_div:
+                        showtimes = []
+                        # 查找所有链接（包括已售罄的场次）
+                        time_links = day_div.select('a')
+                        for time_link in time_links:
+                            time_text = time_link.text.strip()
+                            ticket_status = "Available"
+
+                            # 检查是否已售罄
+                            if 'sold_out' in time_link.get('class', []):
+                                ticket_status = "Sold Out"
+
+                            # 确保时间文本不为空且不包含不相关的文本
+                            if time_text and ":" in time_text and "Buy" not in time_text:
+                                showtimes.append({
+                                    "time": time_text,
+                                    "status": ticket_status
+                                })
+
+                        if showtimes:  # 只添加有放映时间的日期
+                            screening_days.append({
+                                "date": day_text,
+                                "showtimes": showtimes
+                            })
+        else:
+            # 处理没有日期选择器的情况（例如 Titane 案例）
+            # 尝试从 date_picker_holder 直接获取日期
+            date_holder = soup.select_one('.date_picker_holder')
+            if date_holder:
+                day_text = date_holder.text.strip()
+                if not day_text and date_holder.select_one('a'):
+                    day_text = date_holder.select_one('a').text.strip()
+
+                if day_text:
+                    # 尝试找到对应的放映时间容器
+                    # 查找所有 film_day 类的 div
+                    day_divs = soup.select('.film_day')
+                    for day_div in day_divs:
+                        # 检查 day_div 是否有标识日期的元素
+                        day_title = day_div.select_one('h5.sr-only')
+                        current_day_text = day_title.text.strip() if day_title else ""
+
+                        # 如果找到匹配的日期或只有一个放映日 div
+                        if not current_day_text or current_day_text == day_text or len(day_divs) == 1:
+                            showtimes = []
+
+                            # 处理所有链接，包括已售罄的
+                            time_links = day_div.select('a')
+                            for time_link in time_links:
+                                time_text = time_link.text.strip()
+                                ticket_status = "Available"
+
+                                # 检查是否已售罄
+                                if 'sold_out' in time_link.get('class', []):
+                                    ticket_status = "Sold Out"
+
+                                # 确保时间文本是有效的
+                                if time_text and ":" in time_text and "Buy" not in time_text:
+                                    showtimes.append({
+                                        "time": time_text,
+                                        "status": ticket_status
+                                    })
+
+                            if showtimes:  # 只添加有放映时间的日期
+                                screening_days.append({
+                                    "date": day_text,
+                                    "showtimes": showtimes
+                                })
+
+            # 如果仍然没有找到放映时间，尝试直接从 film_day div 中获取
+            if not screening_days:
+                day_divs = soup.select('.film_day')
+                for day_div in day_divs:
+                    day_title = day_div.select_one('h5.sr-only')
+                    if day_title and day_title.text.strip():
+                        day_text = day_title.text.strip()
+                        showtimes = []
+
+                        # 处理所有链接，包括已售罄的
+                        time_links = day_div.select('a')
+                        for time_link in time_links:
+                            time_text = time_link.text.strip()
+                            ticket_status = "Available"
+
+                            if 'sold_out' in time_link.get('class', []):
+                                ticket_status = "Sold Out"
+
+                            if time_text and ":" in time_text and "Buy" not in time_text:
+                                showtimes.append({
+                                    "time": time_text,
+                                    "status": ticket_status
+                                })
+
+                        if showtimes:
+                            screening_days.append({
+                                "date": day_text,
+                                "showtimes": showtimes
+                            })
+
+        if screening_days:
+            details["all_screenings"] = screening_days
+
+        return details
@@ -0,0 +1,119 @@
+"""
+基于 SQLite 的本地任务队列 - 多个进程共享同一个数据库文件领取电影详情任务
+
+每次领取都带有租约（lease），工作进程需定期续约；进程崩溃后租约过期，
+任务会被其他进程重新领取，超过最大尝试次数后标记为失败
+"""
+
+import json
+import time
+import sqlite3
+
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+FAILED = "failed"
+
+
+class WorkQueue:
+    """电影详情任务队列"""
+
+    def __init__(self, db_path="work_queue.sqlite3", lease_seconds=60, max_attempts=3):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds  # 租约时长（秒）
+        self.max_attempts = max_attempts  # 每个任务最多尝试次数
+        # isolation_level=None 时由我们自己控制事务，领取任务时使用 BEGIN IMMEDIATE 加写锁
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                film_id TEXT PRIMARY KEY,
+                movie TEXT NOT NULL,
+                state TEXT NOT NULL,
+                worker TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT
+            )
+            """
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def reset(self, movies):
+        """清空队列并加入新的任务，movies 为 {film_id: movie}"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM jobs")
+            self.conn.executemany(
+                "INSERT INTO jobs (film_id, movie, state) VALUES (?, ?, ?)",
+                [(film_id, json.dumps(movie, ensure_ascii=False), PENDING) for film_id, movie in movies.items()]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def claim(self, worker_id, limit=1):
+        """领取最多 limit 个任务，租约过期的任务会被重新领取；返回电影信息列表"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 租约过期且已达到最大尝试次数的任务标记为失败
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, worker = NULL WHERE state = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, CLAIMED, now, self.max_attempts)
+            )
+            rows = self.conn.execute(
+                "SELECT film_id, movie FROM jobs WHERE state = ? OR (state = ? AND lease_until < ?) LIMIT ?",
+                (PENDING, CLAIMED, now, limit)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = attempts + 1 WHERE film_id = ?",
+                [(CLAIMED, worker_id, now + self.lease_seconds, film_id) for film_id, _ in rows]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [json.loads(movie) for _, movie in rows]
+
+    def renew(self, worker_id, film_ids):
+        """为仍在处理的任务续约"""
+        self.conn.executemany(
+            "UPDATE jobs SET lease_until = ? WHERE film_id = ? AND worker = ? AND state = ?",
+            [(time.time() + self.lease_seconds, film_id, worker_id, CLAIMED) for film_id in film_ids]
+        )
+
+    def complete(self, worker_id, film_id, result):
+        """提交任务结果；结果为空时退回队列，超过最大尝试次数则标记为失败"""
+        if result:
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, lease_until = NULL WHERE film_id = ? AND worker = ? AND state = ?",
+                (DONE, json.dumps(result, ensure_ascii=False), film_id, worker_id, CLAIMED)
+            )
+        else:
+            self.conn.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, worker = NULL, lease_until = NULL "
+                "WHERE film_id = ? AND worker = ? AND state = ?",
+                (self.max_attempts, FAILED, PENDING, film_id, worker_id, CLAIMED)
+            )
+
+    def counts(self):
+        """各状态的任务数量"""
+        counts = {PENDING: 0, CLAIMED: 0, DONE: 0, FAILED: 0}
+        for state, count in self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"):
+            counts[state] = count
+        return counts
+
+    def unfinished(self):
+        """尚未完成（待领取或处理中）的任务数量"""
+        counts = self.counts()
+        return counts[PENDING] + counts[CLAIMED]
+
+    def results(self):
+        """所有已完成任务的结果"""
+        rows = self.conn.execute("SELECT result FROM jobs WHERE state = ?", (DONE,))
+        return [json.loads(result) for (result,) in rows]
@@ -0,0 +1,132 @@
+"""
+多进程抓取电影详情 - 协调进程把电影加入本地队列，N 个工作进程各自启动浏览器（或回放存档）领取任务并写回结果
+所有任务完成后由协调进程整合结果并保存
+"""
+
+import os
+import asyncio
+import multiprocessing
+
+from work_queue import WorkQueue
+
+# 没有可领取的任务时，等待其他进程的租约过期再重试的间隔（秒）
+IDLE_POLL_SECONDS = 1.0
+
+
+async def heartbeat(queue, worker_id, in_flight):
+    """定期为正在处理的任务续约"""
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        if in_flight:
+            queue.renew(worker_id, list(in_flight))
+
+
+async def run_worker(db_path, worker_id, concurrency=5, replay_path=None, lease_seconds=60, base_url=None):
+    """工作进程：始终保持 concurrency 个任务在处理，任一任务完成即领取下一个，直到队列中没有未完成的任务"""
+    from metrograph import MetrographScraper
+
+    queue = WorkQueue(db_path, lease_seconds=lease_seconds)
+    scraper = MetrographScraper(concurrency=concurrency, replay_path=replay_path, base_url=base_url)
+    in_flight = set()
+    beat = asyncio.create_task(heartbeat(queue, worker_id, in_flight))
+    tasks = set()
+    done = 0
+
+    async def process(movie):
+        film_id = movie["vista_film_id"]
+        in_flight.add(film_id)
+        try:
+            result = await scraper.scrape_single_movie(movie, set())
+        finally:
+            in_flight.discard(film_id)
+        queue.complete(worker_id, film_id, result)
+        return result
+
+    try:
+        await scraper.initialize_fetcher()
+        while True:
+            free = concurrency - len(tasks)
+            if free > 0:
+                tasks.update(asyncio.create_task(process(movie)) for movie in queue.claim(worker_id, limit=free))
+            if not tasks:
+                # 其他进程仍在处理的任务可能因崩溃而过期，等待后重试
+                if queue.unfinished() == 0:
+                    break
+                await asyncio.sleep(IDLE_POLL_SECONDS)
+                continue
+            # 任一任务完成后立即回到循环填补空位；有空位但暂时没有可领取的任务时，定期重试
+            finished, tasks = await asyncio.wait(tasks, timeout=IDLE_POLL_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+            done += sum(1 for task in finished if task.result())
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        beat.cancel()
+        await scraper.close()
+        queue.close()
+
+    print(f"[{worker_id}] 完成 {done} 部电影的详情")
+
+
+def worker_main(db_path, worker_id, concurrency=5, replay_path=None, lease_seconds=60, base_url=None):
+    """工作进程入口"""
+    asyncio.run(run_worker(db_path, worker_id, concurrency, replay_path, lease_seconds, base_url))
+
+
+async def scrape_details_sharded(films_to_scrape, workers=4, db_path="work_queue.sqlite3",
+                                 concurrency=5, replay_path=None, lease_seconds=60, max_restarts=None,
+                                 base_url=None):
+    """
+    协调进程：把电影加入队列，启动 workers 个工作进程，等待全部完成后返回抓取结果
+
+    工作进程异常退出时重新启动一个替代进程（最多 max_restarts 次，默认与 workers 相同），
+    它领取的任务在租约过期后会被重新领取
+    """
+    if max_restarts is None:
+        max_restarts = workers
+
+    queue = WorkQueue(db_path, lease_seconds=lease_seconds)
+    queue.reset(films_to_scrape)
+
+    # 使用 spawn 避免子进程继承父进程的事件循环和浏览器连接
+    ctx = multiprocessing.get_context("spawn")
+    spawned = 0
+
+    def spawn():
+        nonlocal spawned
+        spawned += 1
+        process = ctx.Process(
+            target=worker_main,
+            args=(db_path, f"worker-{spawned}-{os.getpid()}", concurrency, replay_path, lease_seconds, base_url),
+            daemon=True
+        )
+        process.start()
+        return process
+
+    processes = [spawn() for _ in range(workers)]
+    restarts = 0
+
+    try:
+        while True:
+            await asyncio.sleep(IDLE_POLL_SECONDS / 4)
+            for i, process in enumerate(processes):
+                if process.is_alive() or process.exitcode == 0:
+                    continue
+                if restarts >= max_restarts or queue.unfinished() == 0:
+                    continue
+                print(f"工作进程异常退出（退出码 {process.exitcode}），重新启动")
+                restarts += 1
+                processes[i] = spawn()
+            if not any(process.is_alive() for process in processes):
+                break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    counts = queue.counts()
+    print(f"队列完成 {counts['done']} 个任务，失败 {counts['failed']} 个，未完成 {counts['pending'] + counts['claimed']} 个")
+    results = queue.results()
+    queue.close()
+    return results